@@ -1,15 +1,35 @@
+import os
+
 from django.contrib import admin, messages
+from django.contrib.admin.options import IncorrectLookupParameters
+from django.contrib.admin.views.main import ERROR_FLAG, ChangeList
+from django.core.exceptions import PermissionDenied
+from django.http import FileResponse, Http404, JsonResponse, StreamingHttpResponse
 from django.shortcuts import render, redirect
 from django.urls import path, reverse
 from django.core.files.storage import default_storage
+from django.utils import timezone
+from .export import iter_csv
+from .ledger import defers_credits, ledger_balance
 from .models import Card
 from .forms.create import CardForm
-from .tasks import import_cards_from_excel_task
+from .tasks import get_import_progress, start_card_import
 from apps.cards.filters.card_filter import BalanceFilter, PhoneFilter, ExpireYearFilter
 
+
+class ExportChangeList(ChangeList):
+    """
+        ChangeList that only builds the filtered queryset: get_results()
+        (COUNT queries and the page fetch) is skipped, since the export
+        streams the whole queryset itself.
+    """
+
+    def get_results(self, request):
+        pass
+
 @admin.register(Card)
 class CardAdmin(admin.ModelAdmin):
-    list_display = ("format_card_number", "expire", "phone", "status", "balance")
+    list_display = ("format_card_number", "expire", "phone", "status", "display_balance")
     list_filter = ("status", PhoneFilter,ExpireYearFilter, BalanceFilter)
     search_fields = ("card_number", "phone")
     form = CardForm
@@ -19,26 +39,100 @@ class CardAdmin(admin.ModelAdmin):
         urls = super().get_urls()
         custom_urls = [
             path("import-excel/", self.import_excel, name="cards_card_import_excel"),
+            path(
+                "export-csv/",
+                self.admin_site.admin_view(self.export_csv),
+                name="cards_card_export_csv",
+            ),
+            path(
+                "import-excel/<str:task_id>/status/",
+                self.admin_site.admin_view(self.import_excel_status),
+                name="cards_card_import_excel_status",
+            ),
+            path(
+                "import-excel/<str:task_id>/rejects/",
+                self.admin_site.admin_view(self.import_excel_rejects),
+                name="cards_card_import_excel_rejects",
+            ),
         ]
         return custom_urls + urls
 
+    def get_changelist(self, request, **kwargs):
+        if request.resolver_match and request.resolver_match.url_name == "cards_card_export_csv":
+            return ExportChangeList
+        return super().get_changelist(request, **kwargs)
+
+    @admin.display(description="Balance", ordering="balance")
+    def display_balance(self, obj):
+        """
+            Karta balansi. Kreditlari kechiktiriladigan kartalar uchun
+            (CARD_LEDGER_DEFERRED_CREDIT_CARDS) hali Card.balance'ga
+            qo'shilmagan kreditlar bilan birga ledger bo'yicha hisoblanadi.
+        """
+        if defers_credits(obj.card_number):
+            return ledger_balance(obj)
+        return obj.balance
+
+    def export_csv(self, request):
+        """
+            Changelist'da tanlangan filtrlar va qidiruv natijasidagi kartalarni
+            CSV ko'rinishida oqim (StreamingHttpResponse) bilan yuklab beradi.
+            Qatorlar server-side cursor orqali bo'lib-bo'lib o'qiladi,
+            shuning uchun natija hajmi xotiraga ta'sir qilmaydi.
+            Noto'g'ri filtr parametrlari bo'lsa, changelist sahifasiga
+            (Django kabi ?e=1 bilan) qaytaradi.
+        """
+        if not self.has_view_permission(request):
+            raise PermissionDenied
+        try:
+            queryset = self.get_changelist_instance(request).queryset
+        except IncorrectLookupParameters:
+            return redirect(f'{reverse("admin:cards_card_changelist")}?{ERROR_FLAG}=1')
+        filename = f"cards_{timezone.now():%Y%m%d_%H%M%S}.csv"
+        response = StreamingHttpResponse(iter_csv(queryset), content_type="text/csv")
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return response
+
     def import_excel(self, request):
         """
             Admin panel orqali Excel fayl yuklash va uni
             Celery task yordamida asinxron tarzda import qilishni boshqaradi.
+            Katta fayllar qatorlar bo'yicha bo'linib, parallel tasklarda import qilinadi.
         """
         if request.method == "POST" and request.FILES.get("excel_file"):
             excel_file = request.FILES["excel_file"]
 
             file_path = default_storage.save(f"tmp/{excel_file.name}", excel_file)
 
-            result = import_cards_from_excel_task.delay(default_storage.path(file_path))
+            result = start_card_import(default_storage.path(file_path))
 
             self.message_user(
                 request,
                 f"Excel import job has been started (task id: {result.id})",
                 level=messages.INFO,
             )
-            return redirect(reverse("admin:cards_card_changelist"))
+            return redirect(f'{reverse("admin:cards_card_import_excel")}?task_id={result.id}')
+
+        return render(request, "admin/cards/import_excel.html", {"task_id": request.GET.get("task_id")})
+
+    def import_excel_status(self, request, task_id):
+        """
+            Import jarayoni holatini JSON ko'rinishida qaytaradi
+            (import_excel.html sahifasi uni muntazam so'rab turadi).
+        """
+        progress = get_import_progress(task_id)
+        result = progress.get("result")
+        if isinstance(result, dict) and result.get("rejects_file"):
+            result["rejects_url"] = reverse("admin:cards_card_import_excel_rejects", args=[task_id])
+            del result["rejects_file"]
+        return JsonResponse(progress)
 
-        return render(request, "admin/cards/import_excel.html")
+    def import_excel_rejects(self, request, task_id):
+        """
+            Rad etilgan qatorlar (xato xabari bilan) CSV faylini yuklab berish.
+        """
+        result = get_import_progress(task_id).get("result")
+        path = result.get("rejects_file") if isinstance(result, dict) else None
+        if not path or not os.path.exists(path):
+            raise Http404("Rejected rows report not found")
+        return FileResponse(open(path, "rb"), as_attachment=True, filename=f"rejected_{task_id}.csv")
@@ -0,0 +1,199 @@
+import hashlib
+import logging
+import math
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+from apps.cards.models import Card
+from apps.utils.cache import is_shared_cache
+
+logger = logging.getLogger(__name__)
+
+CACHE_KEY_RECENT_CARD = 'card_bloom:recent:{card_number}'
+
+BLOOM_ENABLED = getattr(settings, 'CARD_BLOOM_ENABLED', True)
+# Target false-positive rate at the sized capacity
+BLOOM_FPR = getattr(settings, 'CARD_BLOOM_FPR', 0.001)
+# The filter is rebuilt in the background when it is older than this (seconds)
+BLOOM_REBUILD_INTERVAL = getattr(settings, 'CARD_BLOOM_REBUILD_INTERVAL', 600)
+# Extra capacity for cards created between two rebuilds
+BLOOM_HEADROOM = 1.2
+
+
+class BloomFilter:
+    """
+        A fixed-size Bloom filter over strings.
+
+        `number in bloom` is False only for numbers that were never added;
+        True can be a false positive with probability `false_positive_rate`.
+    """
+
+    def __init__(self, capacity: int, fpr: float = BLOOM_FPR):
+        capacity = max(capacity, 1000)
+        self.size = math.ceil(-capacity * math.log(fpr) / math.log(2) ** 2)
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, value: str):
+        digest = hashlib.blake2b(value.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, value: str) -> None:
+        """
+            Adds a value. `count` only grows when a bit was newly set, so
+            re-adding a value (or a false positive) does not inflate it.
+        """
+        added = False
+        for position in self._positions(value):
+            mask = 1 << (position & 7)
+            if not self.bits[position >> 3] & mask:
+                self.bits[position >> 3] |= mask
+                added = True
+        if added:
+            self.count += 1
+
+    def __contains__(self, value: str) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(value))
+
+    @property
+    def false_positive_rate(self) -> float:
+        """
+            Estimated false-positive rate for the number of items added so far.
+        """
+        return (1 - math.exp(-self.hashes * self.count / self.size)) ** self.hashes
+
+    @property
+    def memory_bytes(self) -> int:
+        return len(self.bits)
+
+
+_lock = threading.Lock()
+_filter = None
+_built_at = 0.0
+_rebuilding = False
+
+
+def build_card_filter() -> BloomFilter:
+    """
+        Builds a filter over every card number, streaming them with a server-side cursor.
+    """
+    start = time.perf_counter()
+    bloom = BloomFilter(int(Card.objects.count() * BLOOM_HEADROOM))
+    for card_number in Card.objects.values_list('card_number', flat=True).iterator(chunk_size=10000):
+        bloom.add(card_number)
+    logger.info(
+        f"[BLOOM] Built card filter: {bloom.count} cards, {bloom.memory_bytes} bytes, "
+        f"fpr={bloom.false_positive_rate:.6f} in {time.perf_counter() - start:.2f}s"
+    )
+    return bloom
+
+
+def _rebuild():
+    global _filter, _built_at, _rebuilding
+    try:
+        bloom = build_card_filter()
+        with _lock:
+            _filter, _built_at = bloom, time.monotonic()
+    except Exception as e:
+        logger.error(f"[BLOOM] Card filter rebuild failed: {e}")
+    finally:
+        _rebuilding = False
+
+
+def warm_card_filter() -> None:
+    """
+        Builds the process-local card filter at worker start (called from
+        config.wsgi / config.asgi), so no request pays for the build.
+        On failure the first get_card_filter() call builds it instead.
+    """
+    global _filter, _built_at
+
+    if not BLOOM_ENABLED:
+        return
+    try:
+        bloom = build_card_filter()
+    except Exception as e:
+        logger.error(f"[BLOOM] Card filter warmup failed: {e}")
+        return
+    with _lock:
+        _filter, _built_at = bloom, time.monotonic()
+
+
+def get_card_filter() -> BloomFilter:
+    """
+        Returns the process-local card filter.
+
+        It is normally built by warm_card_filter(); if that did not happen the
+        first call builds it synchronously. Afterwards a filter older than
+        BLOOM_REBUILD_INTERVAL keeps serving while a background thread builds
+        its replacement (which also drops deleted cards and resizes it).
+    """
+    global _filter, _built_at, _rebuilding
+
+    if _filter is None:
+        with _lock:
+            if _filter is None:
+                _filter, _built_at = build_card_filter(), time.monotonic()
+    elif time.monotonic() - _built_at > BLOOM_REBUILD_INTERVAL and not _rebuilding:
+        with _lock:
+            if not _rebuilding:
+                _rebuilding = True
+                threading.Thread(target=_rebuild, name='card-bloom-rebuild', daemon=True).start()
+    return _filter
+
+
+def register_cards(*card_numbers) -> None:
+    """
+        Adds new cards to the local filter and marks them as recent in the
+        shared cache, so other processes accept them until their next rebuild
+        (see card_may_exist for when the marks are not trusted).
+    """
+    if _filter is not None:
+        for card_number in card_numbers:
+            _filter.add(card_number)
+    cache.set_many(
+        {CACHE_KEY_RECENT_CARD.format(card_number=number): 1 for number in card_numbers},
+        timeout=BLOOM_REBUILD_INTERVAL * 2,
+    )
+
+
+def card_may_exist(card_number: str) -> bool:
+    """
+        Returns False only if the card number certainly does not exist
+        (then neither the database nor the card info cache need to be asked).
+
+        A number missing from the filter may still be a card created by
+        another process since the filter was built. The recent-card marks
+        cover that only when they live in a shared cache and the filter is
+        younger than BLOOM_REBUILD_INTERVAL (the marks outlive it by one
+        interval); otherwise the database is asked.
+    """
+    if not BLOOM_ENABLED:
+        return True
+    bloom = get_card_filter()
+    if card_number in bloom:
+        return True
+    if is_shared_cache() and time.monotonic() - _built_at <= BLOOM_REBUILD_INTERVAL:
+        return cache.get(CACHE_KEY_RECENT_CARD.format(card_number=card_number)) is not None
+    return Card.objects.filter(card_number=card_number).exists()
+
+
+def card_filter_stats() -> dict:
+    """
+        Size and accuracy figures of the local card filter.
+    """
+    bloom = get_card_filter()
+    return {
+        "cards": bloom.count,
+        "bits": bloom.size,
+        "hashes": bloom.hashes,
+        "memory_bytes": bloom.memory_bytes,
+        "false_positive_rate": bloom.false_positive_rate,
+        "age_seconds": round(time.monotonic() - _built_at, 1),
+    }
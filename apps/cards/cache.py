@@ -0,0 +1,161 @@
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from apps.cards.bloom import card_may_exist
+from apps.cards.models import Card
+from apps.cards.models.card import AUTH_FIELDS
+from apps.utils.cache import cache_entry, get_or_compute, is_shared_cache
+from apps.utils.services import parse_expire
+
+CACHE_KEY_CARD_VERSION = 'card_info:version:{card_number}'
+CACHE_KEY_CARD_INFO = 'card_info:{card_number}:{month}:{year}:{version}'
+
+# In a shared cache entries are invalidated by version bumps and the TTL only
+# bounds memory use. A per-process cache never sees the bumps made by other
+# processes, so there the TTL is what bounds how stale a card can be.
+CARD_INFO_TTL = getattr(settings, 'CARD_INFO_CACHE_TTL', 300 if is_shared_cache() else 30)
+CARD_VERSION_TTL = CARD_INFO_TTL * 2
+
+
+def card_versions(card_numbers):
+    """
+        Returns the current cache versions of several cards with one
+        get_many (and one set_many for cards that have none yet).
+    """
+    keys = {number: CACHE_KEY_CARD_VERSION.format(card_number=number) for number in card_numbers}
+    found = cache.get_many(keys.values())
+    versions = {number: found.get(key) for number, key in keys.items()}
+    missing = {number: uuid.uuid4().hex for number, version in versions.items() if version is None}
+    if missing:
+        # Replacing a version concurrently created by another process is harmless:
+        # nothing is cached under a version that nobody has read yet.
+        cache.set_many({keys[number]: version for number, version in missing.items()}, timeout=CARD_VERSION_TTL)
+        versions.update(missing)
+    return versions
+
+
+def card_version(card_number):
+    """
+        Returns the current cache version of a card, creating it on first use.
+    """
+    key = CACHE_KEY_CARD_VERSION.format(card_number=card_number)
+    version = cache.get(key)
+    if version is None:
+        version = uuid.uuid4().hex
+        if not cache.add(key, version, timeout=CARD_VERSION_TTL):
+            version = cache.get(key, version)
+    return version
+
+
+def bump_card_versions(*card_numbers):
+    """
+        Gives the cards a new cache version, so their cached info is never
+        read again. Runs after the current transaction commits: bumping
+        earlier would let a concurrent reader cache the old row under the
+        new version.
+
+        Needed wherever cards change without Card.save() (update(), bulk writes);
+        saves are covered by the post_save signal.
+    """
+    card_numbers = [number for number in card_numbers if number]
+    if not card_numbers:
+        return
+
+    def bump():
+        cache.set_many(
+            {CACHE_KEY_CARD_VERSION.format(card_number=number): uuid.uuid4().hex for number in card_numbers},
+            timeout=CARD_VERSION_TTL,
+        )
+
+    transaction.on_commit(bump)
+
+
+def card_info_key(card_number, expire, version):
+    """
+        Builds the cache key of a card info entry. The expiry date is
+        normalized, so every supported format shares one entry.
+    """
+    month, year = parse_expire(expire, year_only=False) or (None, None)
+    return CACHE_KEY_CARD_INFO.format(card_number=card_number, month=month, year=year, version=version)
+
+
+def card_info_data(card):
+    """
+        Public card info returned by the card info API.
+    """
+    return {
+        "card_status": card.status,
+        "balance": card.balance,
+        "phone": card.phone,
+        "masked_card": f"{card.card_number[:6]}******{card.card_number[-4:]}",
+    }
+
+
+def get_card_info(card_number, expire):
+    """
+        Returns the card info of a card (read-through cache with stampede
+        protection, see apps.utils.cache.get_or_compute).
+
+        Card numbers rejected by the card Bloom filter are answered without
+        querying the database or writing a cache entry.
+
+        Returns:
+            dict | None: Card info, or None if the number and expiry date
+                         do not match any card (misses are cached too).
+    """
+    if not card_may_exist(card_number):
+        return None
+
+    def compute():
+        card = Card.objects.authenticate(card_number, expire)
+        return card_info_data(card) if card is not None else None
+
+    key = card_info_key(card_number, expire, card_version(card_number))
+    return get_or_compute(key, compute, timeout=CARD_INFO_TTL)
+
+
+def get_card_infos(items):
+    """
+        Batch variant of get_card_info for (card_number, expire) pairs.
+
+        Uses one get_many for the versions, one get_many for the entries,
+        one IN query for the cache misses and one set_many to cache them.
+
+        Returns:
+            list[dict | None]: Card info per pair, in input order (None if not found).
+    """
+    results = [None] * len(items)
+    candidates = [(index, number, expire) for index, (number, expire) in enumerate(items) if card_may_exist(number)]
+    if not candidates:
+        return results
+
+    versions = card_versions({number for _, number, _ in candidates})
+    keys = {index: card_info_key(number, expire, versions[number]) for index, number, expire in candidates}
+    entries = cache.get_many(set(keys.values()))
+
+    misses = []
+    for index, number, expire in candidates:
+        entry = entries.get(keys[index])
+        if entry is not None:
+            results[index] = entry[0]
+        else:
+            misses.append((index, number, expire))
+    if not misses:
+        return results
+
+    cards = {
+        card.card_number: card
+        for card in Card.objects.filter(card_number__in={number for _, number, _ in misses})
+        .only(*AUTH_FIELDS, "expire_month", "expire_year")
+    }
+    new_entries = {}
+    for index, number, expire in misses:
+        card = cards.get(number)
+        matches = card is not None and (card.expire_month, card.expire_year) == parse_expire(expire, year_only=False)
+        results[index] = card_info_data(card) if matches else None
+        new_entries[keys[index]] = cache_entry(results[index], CARD_INFO_TTL)
+    cache.set_many(new_entries, timeout=CARD_INFO_TTL)
+    return results
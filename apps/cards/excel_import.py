@@ -0,0 +1,379 @@
+import csv
+import json
+import logging
+import os
+import time
+from collections import Counter
+from decimal import Decimal, InvalidOperation
+from itertools import islice
+
+from django.conf import settings
+from django.db import DatabaseError, transaction
+from openpyxl import load_workbook
+
+from apps.cards.bloom import register_cards
+from apps.cards.cache import bump_card_versions
+from apps.cards.models import Card
+
+logger = logging.getLogger(__name__)
+
+# Rows per bulk upsert; memory use of an import is bounded by this number
+CHUNK_SIZE = getattr(settings, "CARD_IMPORT_CHUNK_SIZE", 2000)
+
+# Files with more data rows than this are split into row ranges imported by parallel tasks;
+# the workbook is parsed once and every range is handed over as a JSON lines file
+PARALLEL_THRESHOLD = getattr(settings, "CARD_IMPORT_PARALLEL_THRESHOLD", 50_000)
+ROWS_PER_TASK = getattr(settings, "CARD_IMPORT_ROWS_PER_TASK", 50_000)
+
+CARD_STATUSES = {s.value for s in Card.Status}
+UPSERT_FIELDS = ["expire", "expire_month", "expire_year", "phone", "status", "balance", "updated_at"]
+MAX_BALANCE = Decimal("1e13")  # Card.balance is DecimalField(max_digits=15, decimal_places=2)
+
+
+def parse_card_row(header: list[str], row: tuple) -> Card:
+    """
+        Builds an (unsaved) Card from one Excel row.
+
+        Args:
+            header (list[str]): Lower-cased column names from the first row.
+            row (tuple): Cell values of the row.
+
+        Returns:
+            Card: Card instance ready for bulk upsert.
+
+        Raises:
+            ValueError: If the row does not describe a valid card.
+    """
+    data = dict(zip(header, row))
+    card_number = str(data.get("card_number") or "").strip()
+    expire = str(data.get("expire") or "").strip()
+    phone = str(data.get("phone") or "").strip()
+    status = str(data.get("status") or "").lower()
+
+    if not card_number or len(card_number) > 16:
+        raise ValueError("Invalid card number")
+    if len(expire) > 10:
+        raise ValueError("Invalid expiry date")
+    if len(phone) > 13:
+        raise ValueError("Invalid phone number")
+    if status not in CARD_STATUSES:
+        raise ValueError("Invalid status")
+
+    try:
+        balance = Decimal(str(data.get("balance") or 0)).quantize(Decimal("0.01"))
+    except InvalidOperation:
+        raise ValueError("Invalid balance")
+    if not balance.is_finite() or abs(balance) >= MAX_BALANCE:
+        raise ValueError("Invalid balance")
+
+    card = Card(card_number=card_number, expire=expire, phone=phone, status=status, balance=balance)
+    card.set_expire_parts()  # bulk_create does not call Card.save()
+    return card
+
+
+def upsert_cards(cards: list[Card]) -> None:
+    """
+        Inserts or updates a chunk of cards with one bulk statement
+        (INSERT ... ON CONFLICT (card_number) DO UPDATE).
+
+        A card number that appears several times in the chunk is written once,
+        with the values of its last row (same result as per-row update_or_create).
+        bulk_create skips post_save, so the cached card info is invalidated
+        and the card Bloom filter is updated here. The upsert does not tell
+        which rows were inserted, so the card counter is recounted once the
+        whole import is done (apps.utils.stats.recount_cards).
+    """
+    unique = {card.card_number: card for card in cards}
+    Card.objects.bulk_create(
+        list(unique.values()),
+        update_conflicts=True,
+        unique_fields=["card_number"],
+        update_fields=UPSERT_FIELDS,
+    )
+    bump_card_versions(*unique)
+    register_cards(*unique)
+
+
+def read_header(ws) -> list[str]:
+    """
+        Returns the lower-cased column names from the first row of a worksheet.
+    """
+    first_row = next(ws.iter_rows(min_row=1, max_row=1, values_only=True), ())
+    return [str(h or "").strip().lower() for h in first_row]
+
+
+class RejectWriter:
+    """
+        Streams rejected rows into a CSV file: row number, error message, original cells.
+
+        The file is only created when the first row is rejected, so clean
+        imports leave nothing behind (`path` stays None).
+    """
+
+    def __init__(self, path: str, header: list[str]):
+        self.target = path
+        self.header = header
+        self.path = None
+        self._file = None
+        self._writer = None
+
+    def write(self, row_number: int, error: str, row: tuple) -> None:
+        if self._writer is None:
+            self._file = open(self.target, "w", newline="", encoding="utf-8")
+            self._writer = csv.writer(self._file)
+            self._writer.writerow(["row", "error", *self.header])
+            self.path = self.target
+        self._writer.writerow([row_number, error, *("" if value is None else value for value in row)])
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def import_rows(header, rows, chunk_size: int = CHUNK_SIZE, first_row: int = 2,
+                rejects: RejectWriter | None = None, progress=None) -> dict:
+    """
+        Validates and upserts rows chunk by chunk.
+
+        If a bulk upsert fails, the chunk is retried row by row,
+        so a single bad row does not reject its whole chunk.
+
+        Args:
+            header (list[str]): Lower-cased column names.
+            rows (iterable): Cell values of consecutive worksheet rows.
+            chunk_size (int): Rows per bulk upsert.
+            first_row (int): Worksheet row number of the first item of `rows`.
+            rejects (RejectWriter | None): Receives every rejected row with its error message.
+            progress (callable | None): Called after each chunk with the running counters.
+
+        Returns:
+            dict: Number of processed, imported and rejected rows, and rejected rows per reason.
+    """
+    processed, imported, rejected = 0, 0, 0
+    reasons = Counter()
+    rows = iter(rows)
+
+    def reject(row_number, row, error):
+        nonlocal rejected
+        rejected += 1
+        reasons[error] += 1
+        if rejects is not None:
+            rejects.write(row_number, error, row)
+
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            break
+        chunk_start = first_row + processed
+        processed += len(chunk)
+
+        parsed = []
+        for row_number, row in enumerate(chunk, start=chunk_start):
+            if row is None or all(value is None for value in row):
+                continue
+            try:
+                parsed.append((row_number, row, parse_card_row(header, row)))
+            except ValueError as e:
+                reject(row_number, row, str(e))
+
+        if parsed:
+            try:
+                with transaction.atomic():
+                    upsert_cards([card for _, _, card in parsed])
+                imported += len(parsed)
+            except DatabaseError:
+                logger.warning("[IMPORT] Bulk upsert failed, retrying the chunk row by row")
+                for row_number, row, card in parsed:
+                    try:
+                        with transaction.atomic():
+                            upsert_cards([card])
+                        imported += 1
+                    except DatabaseError as e:
+                        reject(row_number, row, f"Database error: {e.__class__.__name__}")
+
+        if progress is not None:
+            progress(processed=processed, imported=imported, rejected=rejected)
+
+    return {"processed": processed, "imported": imported, "rejected": rejected, "reasons": dict(reasons)}
+
+
+def import_cards_from_excel(file_path: str, chunk_size: int = CHUNK_SIZE,
+                            min_row: int = 2, max_row: int | None = None,
+                            rejects_path: str | None = None, progress=None) -> dict:
+    """
+        Streams an Excel file (openpyxl read-only mode) into the Card table.
+
+        Rows are never materialized all at once: they are read lazily and
+        written in chunks of `chunk_size` with bulk upserts.
+
+        Args:
+            file_path (str): Path of the .xlsx file.
+            chunk_size (int): Rows per bulk upsert.
+            min_row (int): First worksheet row to import (row 1 is the header).
+            max_row (int | None): Last worksheet row to import, None for the end of the sheet.
+            rejects_path (str | None): Where to write the CSV report of rejected rows.
+            progress (callable | None): Progress callback, see import_rows.
+
+        Returns:
+            dict: processed/imported/rejected counters, reject reasons, the path of
+                  the rejected rows report (None if nothing was rejected),
+                  elapsed seconds and rows per second.
+    """
+    start = time.perf_counter()
+    wb = load_workbook(file_path, read_only=True, data_only=True)
+    rejects = None
+    try:
+        ws = wb.active
+        header = read_header(ws)
+        if rejects_path:
+            rejects = RejectWriter(rejects_path, header)
+        rows = ws.iter_rows(min_row=min_row, max_row=max_row, values_only=True)
+        result = import_rows(header, rows, chunk_size, first_row=min_row, rejects=rejects, progress=progress)
+    finally:
+        wb.close()
+        if rejects is not None:
+            rejects.close()
+
+    elapsed = time.perf_counter() - start
+    result["rejects_file"] = rejects.path if rejects is not None else None
+    result["elapsed"] = round(elapsed, 3)
+    result["rows_per_sec"] = round(result["processed"] / elapsed, 1) if elapsed else None
+    return result
+
+
+def rejects_path_for(file_path: str, min_row: int | None = None, max_row: int | None = None) -> str:
+    """
+        Returns the path of the rejected rows report of an uploaded file
+        (or of one row range of it), next to the upload itself.
+    """
+    base = file_path.rsplit(".", 1)[0]
+    if min_row is None:
+        return f"{base}_rejected.csv"
+    return f"{base}_rows_{min_row}_{max_row}_rejected.csv"
+
+
+def merge_reject_files(paths: list[str], target: str) -> str | None:
+    """
+        Concatenates the rejected rows reports of the row ranges of one import
+        into `target` (keeping a single header line) and removes the parts.
+
+        Returns:
+            str | None: `target`, or None if no range rejected anything.
+    """
+    paths = [path for path in paths if path]
+    if not paths:
+        return None
+    with open(target, "w", newline="", encoding="utf-8") as out:
+        for index, path in enumerate(paths):
+            with open(path, newline="", encoding="utf-8") as part:
+                header = part.readline()
+                if index == 0:
+                    out.write(header)
+                for line in part:
+                    out.write(line)
+            os.remove(path)
+    return target
+
+
+def count_data_rows(file_path: str) -> int | None:
+    """
+        Returns the number of data rows (without the header) declared in the
+        worksheet dimensions, or None if the file does not declare them.
+    """
+    wb = load_workbook(file_path, read_only=True)
+    try:
+        max_row = wb.active.max_row
+    finally:
+        wb.close()
+    return max_row - 1 if max_row else None
+
+
+def chunk_path_for(file_path: str, min_row: int) -> str:
+    """
+        Returns the path of the JSON lines file holding the row range of an
+        upload that starts at `min_row`, next to the upload itself.
+    """
+    return f"{file_path.rsplit('.', 1)[0]}_rows_{min_row}.jsonl"
+
+
+def split_into_chunk_files(file_path: str, rows_per_task: int = ROWS_PER_TASK) -> tuple[list[str], list[tuple]]:
+    """
+        Reads the worksheet once and writes its data rows into JSON lines
+        files of `rows_per_task` rows (one JSON array of cell values per line),
+        so the range tasks never parse the workbook themselves.
+
+        Cell values JSON has no type for (dates) are written as str(), which
+        is also how parse_card_row reads them.
+
+        Returns:
+            tuple: The header and the (chunk_path, min_row, max_row) of every range.
+    """
+    wb = load_workbook(file_path, read_only=True, data_only=True)
+    chunks = []
+    out = None
+    try:
+        ws = wb.active
+        header = read_header(ws)
+        for row_number, row in enumerate(ws.iter_rows(min_row=2, values_only=True), start=2):
+            if (row_number - 2) % rows_per_task == 0:
+                if out is not None:
+                    out.close()
+                chunks.append([chunk_path_for(file_path, row_number), row_number, row_number])
+                out = open(chunks[-1][0], "w", encoding="utf-8")
+            out.write(json.dumps(row, default=str))
+            out.write("\n")
+            chunks[-1][2] = row_number
+    finally:
+        wb.close()
+        if out is not None:
+            out.close()
+    return header, [tuple(chunk) for chunk in chunks]
+
+
+def import_cards_from_chunk_file(chunk_path: str, header: list[str], min_row: int,
+                                 chunk_size: int = CHUNK_SIZE, rejects_path: str | None = None,
+                                 progress=None) -> dict:
+    """
+        Imports one row range written by split_into_chunk_files(), streaming
+        its lines into import_rows().
+
+        Returns:
+            dict: Same summary as import_cards_from_excel().
+    """
+    start = time.perf_counter()
+    rejects = RejectWriter(rejects_path, header) if rejects_path else None
+    try:
+        with open(chunk_path, encoding="utf-8") as chunk:
+            rows = (tuple(json.loads(line)) for line in chunk)
+            result = import_rows(header, rows, chunk_size, first_row=min_row, rejects=rejects, progress=progress)
+    finally:
+        if rejects is not None:
+            rejects.close()
+
+    elapsed = time.perf_counter() - start
+    result["rejects_file"] = rejects.path if rejects is not None else None
+    result["elapsed"] = round(elapsed, 3)
+    result["rows_per_sec"] = round(result["processed"] / elapsed, 1) if elapsed else None
+    return result
+
+
+def merge_import_results(results: list[dict]) -> dict:
+    """
+        Adds up the results of the chunk imports of one file.
+
+        Returns:
+            dict: Total imported/rejected counters, merged reject reasons and
+                  the errors of chunks that failed completely.
+    """
+    merged = {"processed": 0, "imported": 0, "rejected": 0, "reasons": Counter(), "errors": []}
+    for result in results:
+        if "error" in result:
+            merged["errors"].append(result["error"])
+            continue
+        merged["processed"] += result.get("processed", 0)
+        merged["imported"] += result["imported"]
+        merged["rejected"] += result["rejected"]
+        merged["reasons"].update(result.get("reasons", {}))
+    merged["reasons"] = dict(merged["reasons"])
+    return merged
@@ -0,0 +1,259 @@
+import csv
+import gzip
+import io
+import json
+import os
+import shutil
+import tarfile
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+import django
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connections
+from django.db.models import Max, Min, QuerySet
+
+from apps.cards.models import Card
+from apps.utils.services import mask_card_number, mask_expire, mask_phone
+
+EXPORT_FIELDS = ("card_number", "expire", "phone", "status", "balance")
+
+# Output format -> file extension
+FORMATS = {
+    "csv": ".csv",
+    "csv.gz": ".csv.gz",
+    "jsonl": ".jsonl",
+    "parquet": ".parquet",
+}
+
+
+def filter_cards(status: str | None = None, card_number: str | None = None, phone: str | None = None) -> QuerySet:
+    """
+        Returns the cards to export (same filters as the admin search:
+        partial match, spaces ignored).
+    """
+    queryset = Card.objects.all()
+    if status:
+        queryset = queryset.filter(status=status.lower())
+    if card_number:
+        queryset = queryset.filter(card_number__icontains=card_number.replace(" ", ""))
+    if phone:
+        queryset = queryset.filter(phone__icontains=phone.replace(" ", ""))
+    return queryset
+
+
+def iter_batches(queryset: QuerySet, chunk_size: int):
+    """
+        Streams formatted export rows in lists of `chunk_size`, reading the
+        cards with a server-side cursor over a values_list projection.
+        Keeps the queryset's ordering (e.g. the admin changelist sort), with
+        "pk" as the last tiebreaker so the order is deterministic.
+    """
+    ordering = list(queryset.query.order_by) or list(queryset.model._meta.ordering)
+    if not {"pk", "-pk", "id", "-id"} & {field for field in ordering if isinstance(field, str)}:
+        ordering.append("pk")
+    rows = queryset.order_by(*ordering).values_list(*EXPORT_FIELDS).iterator(chunk_size=chunk_size)
+    while batch := list(islice(rows, chunk_size)):
+        yield [
+            (mask_card_number(card_number), mask_expire(expire), mask_phone(phone), status, balance)
+            for card_number, expire, phone, status, balance in batch
+        ]
+
+
+def iter_csv(queryset: QuerySet, chunk_size: int = 2000):
+    """
+        Yields the export of `queryset` as CSV text, one piece per batch
+        (header first), for streaming HTTP responses.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_FIELDS)
+    yield buffer.getvalue()
+    for batch in iter_batches(queryset, chunk_size):
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(batch)
+        yield buffer.getvalue()
+
+
+def require_pyarrow():
+    """
+        Imports pyarrow, which is only needed for the parquet format.
+    """
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise ImproperlyConfigured("The parquet export format requires pyarrow (pip install pyarrow)")
+    return pyarrow
+
+
+def _parquet_schema(pa):
+    return pa.schema([
+        ("card_number", pa.string()),
+        ("expire", pa.string()),
+        ("phone", pa.string()),
+        ("status", pa.string()),
+        ("balance", pa.decimal128(15, 2)),
+    ])
+
+
+def write_file(path: str, fmt: str, batches, header: bool = True) -> int:
+    """
+        Writes batches of export rows into one file.
+
+        Args:
+            path (str): Output file.
+            fmt (str): One of FORMATS.
+            batches (iterable): Lists of row tuples (see iter_batches).
+            header (bool): Write the CSV header line (ignored by other formats).
+
+        Returns:
+            int: Number of rows written.
+    """
+    written = 0
+    if fmt == "parquet":
+        pa = require_pyarrow()
+        schema = _parquet_schema(pa)
+        with pa.parquet.ParquetWriter(path, schema) as writer:
+            for batch in batches:
+                columns = list(zip(*batch))
+                writer.write_table(pa.table(
+                    {name: list(values) for name, values in zip(EXPORT_FIELDS, columns)},
+                    schema=schema,
+                ))
+                written += len(batch)
+            if not written:
+                writer.write_table(schema.empty_table())
+        return written
+
+    opener = gzip.open if fmt == "csv.gz" else open
+    with opener(path, "wt", newline="", encoding="utf-8") as file:
+        if fmt == "jsonl":
+            for batch in batches:
+                file.writelines(
+                    json.dumps(dict(zip(EXPORT_FIELDS, row)), default=str, ensure_ascii=False) + "\n"
+                    for row in batch
+                )
+                written += len(batch)
+        else:
+            writer = csv.writer(file)
+            if header:
+                writer.writerow(EXPORT_FIELDS)
+            for batch in batches:
+                writer.writerows(batch)
+                written += len(batch)
+    return written
+
+
+def split_pk_ranges(queryset: QuerySet, parts: int) -> list[tuple[int, int]]:
+    """
+        Splits the primary keys of `queryset` into at most `parts` contiguous,
+        equally wide (first_pk, last_pk) ranges.
+    """
+    bounds = queryset.aggregate(first=Min("pk"), last=Max("pk"))
+    first, last = bounds["first"], bounds["last"]
+    if first is None:
+        return []
+    step = max(1, -(-(last - first + 1) // parts))
+    return [(start, min(start + step - 1, last)) for start in range(first, last + 1, step)]
+
+
+def _init_worker():
+    django.setup()
+
+
+def export_part(filters: dict, fmt: str, path: str, pk_range: tuple[int, int], chunk_size: int,
+                header: bool) -> int:
+    """
+        Exports one primary key range into its own file (runs in a worker process).
+    """
+    first, last = pk_range
+    queryset = filter_cards(**filters).filter(pk__gte=first, pk__lte=last)
+    try:
+        return write_file(path, fmt, iter_batches(queryset, chunk_size), header=header)
+    finally:
+        connections.close_all()
+
+
+def part_path(output: str, fmt: str, index: int) -> str:
+    base = output.removesuffix(".tar").removesuffix(FORMATS[fmt])
+    return f"{base}.part{index:03d}{FORMATS[fmt]}"
+
+
+def concatenate_parts(parts: list[str], output: str, fmt: str) -> None:
+    """
+        Joins the part files of a parallel export into `output` and removes them.
+
+        CSV parts are written without a header, so the header is written once
+        first; gzip members can be concatenated as they are. Parquet parts are
+        merged row group by row group.
+    """
+    if fmt == "parquet":
+        pa = require_pyarrow()
+        with pa.parquet.ParquetWriter(output, _parquet_schema(pa)) as writer:
+            for path in parts:
+                parquet_file = pa.parquet.ParquetFile(path)
+                for index in range(parquet_file.num_row_groups):
+                    writer.write_table(parquet_file.read_row_group(index))
+    else:
+        write_file(output, fmt, [], header=fmt != "jsonl")
+        with open(output, "ab") as out:
+            for path in parts:
+                with open(path, "rb") as part:
+                    shutil.copyfileobj(part, out)
+    for path in parts:
+        os.remove(path)
+
+
+def archive_parts(parts: list[str], output: str) -> None:
+    """
+        Bundles the part files of a parallel export into one tar file and removes them.
+    """
+    with tarfile.open(output, "w") as tar:
+        for path in parts:
+            tar.add(path, arcname=os.path.basename(path))
+    for path in parts:
+        os.remove(path)
+
+
+def export_cards(output: str, fmt: str = "csv", filters: dict | None = None, workers: int = 1,
+                 chunk_size: int = 5000, archive: bool = False) -> int:
+    """
+        Exports the (filtered) cards into `output`.
+
+        With workers > 1 the card table is split into primary key ranges that
+        are exported by separate processes; the part files are then
+        concatenated into `output`, or bundled into a tar file with archive=True
+        (each part is then a standalone file with its own header).
+
+        Returns:
+            int: Number of exported cards.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown export format: {fmt}")
+    if fmt == "parquet":
+        require_pyarrow()
+    filters = filters or {}
+    queryset = filter_cards(**filters)
+
+    if workers <= 1 and not archive:
+        return write_file(output, fmt, iter_batches(queryset, chunk_size))
+
+    ranges = split_pk_ranges(queryset, workers)
+    parts = [part_path(output, fmt, index) for index in range(len(ranges))]
+
+    # Forked workers must not share the parent's database connections.
+    connections.close_all()
+    with ProcessPoolExecutor(max_workers=max(1, workers), initializer=_init_worker) as executor:
+        futures = [
+            executor.submit(export_part, filters, fmt, path, pk_range, chunk_size, archive)
+            for path, pk_range in zip(parts, ranges)
+        ]
+        exported = sum(future.result() for future in futures)
+
+    if archive:
+        archive_parts(parts, output)
+    else:
+        concatenate_parts(parts, output, fmt)
+    return exported
@@ -128,7 +128,7 @@ class ExpireYearFilter(SimpleListFilter):
                 Generates a list of expiration year options.
 
             queryset(request, queryset):
-                Filters records that contain the chosen expiration year in the `expire` field.
+                Filters records by the normalized `expire_year` column (index seek).
     """
     title: str = 'Expire Year'
     parameter_name: str = 'expire_year'
@@ -158,6 +158,6 @@ class ExpireYearFilter(SimpleListFilter):
             Returns:
                 QuerySet | None: Filtered queryset or the original queryset if no filter is applied.
         """
-        if self.value():
-            return queryset.filter(expire__contains=self.value())
+        if self.value() and self.value().isdigit():
+            return queryset.filter(expire_year=2000 + int(self.value()))
         return queryset
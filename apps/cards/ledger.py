@@ -0,0 +1,167 @@
+import logging
+from datetime import timedelta
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Max, Sum
+from django.utils import timezone
+
+from apps.cards.cache import bump_card_versions
+from apps.cards.models import Card, LedgerEntry, BalanceSnapshot
+
+logger = logging.getLogger(__name__)
+
+# Card numbers (e.g. merchant accounts) that receive so many credits that
+# crediting their row on every transfer would serialize all those transfers.
+# Their credits are only appended to the ledger and folded into Card.balance
+# in batches by apply_pending_credits().
+DEFERRED_CREDIT_CARDS = frozenset(getattr(settings, "CARD_LEDGER_DEFERRED_CREDIT_CARDS", ()))
+
+# Entries younger than this are not snapshotted yet: a transaction that
+# started earlier may still commit an entry with a smaller ID.
+SNAPSHOT_LAG = timedelta(seconds=getattr(settings, "CARD_LEDGER_SNAPSHOT_LAG", 60))
+
+
+def defers_credits(card_number: str) -> bool:
+    """
+        Returns True if credits to this card are batched instead of applied immediately.
+    """
+    return card_number in DEFERRED_CREDIT_CARDS
+
+
+def record_transfer(transfer, sender: Card, receiver: Card, debit: Decimal, credit: Decimal,
+                    credit_applied: bool = True) -> None:
+    """
+        Appends the two ledger entries of a confirmed transfer.
+        Must be called inside the transaction that moves the balances.
+    """
+    LedgerEntry.objects.bulk_create([
+        LedgerEntry(card=sender, transfer_ext_id=transfer.ext_id, amount=-debit),
+        LedgerEntry(card=receiver, transfer_ext_id=transfer.ext_id, amount=credit, applied=credit_applied),
+    ])
+
+
+def _sum(queryset) -> Decimal:
+    return queryset.aggregate(total=Sum("amount"))["total"] or Decimal("0")
+
+
+def ledger_balance(card: Card) -> Decimal:
+    """
+        Computes the balance of a card from the ledger: latest snapshot + ledger tail.
+
+        Cards that have no snapshot yet start from their current Card.balance
+        plus the credits that are not applied to it yet.
+
+        Card.balance stays the spendable balance: debits are checked and
+        applied against it (apps.transfers.services.confirm_transfer), and
+        the cached card info API returns it. For deferred-credit cards it
+        lags behind until apply_pending_credits() runs; this is the value
+        including those credits, shown in the card admin.
+    """
+    snapshot = card.balance_snapshots.order_by("-last_entry_id").first()
+    if snapshot is None:
+        return card.balance + _sum(card.ledger_entries.filter(applied=False))
+    return snapshot.balance + _sum(card.ledger_entries.filter(id__gt=snapshot.last_entry_id))
+
+
+def apply_pending_credits(batch_size: int = 1000) -> int:
+    """
+        Folds deferred credits into Card.balance with one UPDATE per card.
+
+        Returns:
+            int: Number of ledger entries applied.
+    """
+    applied = 0
+    cards = (
+        LedgerEntry.objects.filter(applied=False)
+        .values_list("card_id", "card__card_number")
+        .distinct()
+        .order_by("card_id")[:batch_size]
+    )
+    for card_id, card_number in list(cards):
+        with transaction.atomic():
+            entries = list(
+                LedgerEntry.objects.select_for_update()
+                .filter(card_id=card_id, applied=False)
+                .values_list("id", "amount")
+            )
+            if not entries:
+                continue
+            total = sum((amount for _, amount in entries), Decimal("0"))
+            LedgerEntry.objects.filter(id__in=[pk for pk, _ in entries]).update(applied=True)
+            Card.objects.filter(pk=card_id).update(balance=F("balance") + total, updated_at=timezone.now())
+            bump_card_versions(card_number)
+            applied += len(entries)
+    return applied
+
+
+def take_snapshots(batch_size: int = 500) -> dict:
+    """
+        Incrementally snapshots the cards that have ledger activity since the
+        previous run and reconciles them against Card.balance.
+
+        Only entries after the previous run's high-water mark are scanned. A card
+        that is missed (e.g. the run was interrupted) keeps a correct balance,
+        because ledger_balance() always adds the full tail after its own
+        latest snapshot; it simply gets snapshotted on its next activity.
+
+        Returns:
+            dict: Number of snapshotted cards, cards with drift, and the new high-water mark.
+    """
+    head = (
+        LedgerEntry.objects.filter(created_at__lte=timezone.now() - SNAPSHOT_LAG)
+        .aggregate(head=Max("id"))["head"]
+    )
+    start = BalanceSnapshot.objects.aggregate(start=Max("last_entry_id"))["start"] or 0
+    if head is None or head <= start:
+        return {"snapshots": 0, "drift": 0, "last_entry_id": start}
+
+    card_ids = (
+        LedgerEntry.objects.filter(id__gt=start, id__lte=head)
+        .values_list("card_id", flat=True)
+        .distinct()
+        .order_by("card_id")
+    )
+    snapshots, drift = 0, 0
+    for card_id in card_ids.iterator(chunk_size=batch_size):
+        if not _snapshot_card(card_id, head):
+            drift += 1
+        snapshots += 1
+
+    logger.info(f"[LEDGER] Snapshotted {snapshots} cards up to entry {head}, drift={drift}")
+    return {"snapshots": snapshots, "drift": drift, "last_entry_id": head}
+
+
+def _snapshot_card(card_id: int, head: int) -> bool:
+    """
+        Writes a snapshot of one card at ledger entry `head`.
+
+        Returns:
+            bool: False if the ledger disagrees with Card.balance (the difference is logged).
+    """
+    with transaction.atomic():
+        card = Card.objects.select_for_update().only("id", "balance").get(pk=card_id)
+        entries = LedgerEntry.objects.filter(card_id=card_id)
+        after_head = _sum(entries.filter(id__gt=head))
+        expected_now = card.balance + _sum(entries.filter(applied=False))
+
+        previous = (
+            BalanceSnapshot.objects.filter(card_id=card_id, last_entry_id__lt=head)
+            .order_by("-last_entry_id")
+            .first()
+        )
+        if previous is None:
+            balance = expected_now - after_head
+        else:
+            balance = previous.balance + _sum(entries.filter(id__gt=previous.last_entry_id, id__lte=head))
+
+        BalanceSnapshot.objects.create(card_id=card_id, balance=balance, last_entry_id=head)
+
+    ledger_now = balance + after_head
+    if ledger_now != expected_now:
+        logger.warning(
+            f"[LEDGER] Balance drift on card {card_id}: ledger={ledger_now}, card={expected_now}"
+        )
+        return False
+    return True
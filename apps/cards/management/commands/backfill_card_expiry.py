@@ -0,0 +1,56 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from apps.cards.models import Card
+
+
+class Command(BaseCommand):
+    """
+        Management command that fills the normalized expire_month/expire_year
+        columns of existing cards from their free-form `expire` value.
+
+        Cards are processed in primary key order, in batches of --batch-size,
+        each batch in its own short transaction, so the command can run on a
+        live database and can be restarted at any time.
+
+        Example usage:
+          python manage.py backfill_card_expiry
+          python manage.py backfill_card_expiry --all --batch-size=5000
+    """
+
+    help = "Backfill Card.expire_month/expire_year from Card.expire"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=2000, help="Cards updated per transaction")
+        parser.add_argument("--all", action="store_true", help="Re-parse every card, not only unfilled ones")
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        queryset = Card.objects.all() if options["all"] else Card.objects.filter(expire_year__isnull=True)
+
+        start = time.perf_counter()
+        last_pk, updated, unparsable = 0, 0, 0
+        while True:
+            cards = list(
+                queryset.filter(pk__gt=last_pk)
+                .order_by("pk")
+                .only("id", "expire", "expire_month", "expire_year")[:batch_size]
+            )
+            if not cards:
+                break
+            last_pk = cards[-1].pk
+
+            for card in cards:
+                card.set_expire_parts()
+                if card.expire_year is None:
+                    unparsable += 1
+            with transaction.atomic():
+                Card.objects.bulk_update(cards, ["expire_month", "expire_year"])
+            updated += len(cards)
+            self.stdout.write(f"{updated} cards processed (last id {last_pk})")
+
+        elapsed = time.perf_counter() - start
+        self.stdout.write(self.style.SUCCESS(
+            f"Backfilled {updated} cards in {elapsed:.2f}s, {unparsable} with an unparsable expiry date"
+        ))
@@ -0,0 +1,80 @@
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from apps.cards.models import Card
+
+BENCH_PREFIX = "777777"
+
+
+class Command(BaseCommand):
+    """
+        Benchmarks card authentication lookups (card_number + expire).
+
+        Creates --cards synthetic cards (card numbers starting with 777777)
+        and measures the p50/p99 latency of --lookups random lookups with:
+          - legacy:       Card.objects.get(card_number=..., expire=...)  full row,
+                          exact string match on `expire`
+          - authenticate: Card.objects.authenticate()  AUTH_FIELDS only,
+                          normalized expiry columns
+
+        Runs on a test database (created like the test runner does, TEST
+        settings of the default database), never on the configured one.
+        With --keep the test database and its cards are kept for the next run.
+
+        Example usage:
+          python manage.py bench_card_lookup --cards=10000000 --lookups=20000
+    """
+
+    help = "Measure p50/p99 latency of card_number + expire lookups"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--cards", type=int, default=1_000_000, help="Number of synthetic cards")
+        parser.add_argument("--lookups", type=int, default=10_000, help="Lookups per scenario")
+        parser.add_argument("--batch-size", type=int, default=10_000, help="Cards created per bulk insert")
+        parser.add_argument("--keep", action="store_true", help="Keep the test database and its cards for the next run")
+
+    def handle(self, *args, **options):
+        database_name = connection.settings_dict["NAME"]
+        connection.creation.create_test_db(verbosity=0, autoclobber=True, keepdb=options["keep"])
+        try:
+            existing = Card.objects.filter(card_number__startswith=BENCH_PREFIX).count()
+            if existing < options["cards"]:
+                self._create_cards(existing, options["cards"], options["batch_size"])
+
+            rng = random.Random(42)
+            keys = [self._key(rng.randrange(options["cards"])) for _ in range(options["lookups"])]
+
+            self._report("legacy", keys, lambda number, expire: Card.objects.get(card_number=number, expire=expire))
+            self._report("authenticate", keys, Card.objects.authenticate)
+        finally:
+            connection.creation.destroy_test_db(database_name, verbosity=0, keepdb=options["keep"])
+
+    @staticmethod
+    def _key(index):
+        return f"{BENCH_PREFIX}{index:010d}", f"{index % 12 + 1:02d}/{25 + index % 5}"
+
+    def _create_cards(self, start, total, batch_size):
+        self.stdout.write(f"Creating {total - start} cards...")
+        for first in range(start, total, batch_size):
+            cards = []
+            for index in range(first, min(first + batch_size, total)):
+                number, expire = self._key(index)
+                card = Card(card_number=number, expire=expire, status=Card.Status.ACTIVE, balance=index % 1_000_000)
+                card.set_expire_parts()
+                cards.append(card)
+            Card.objects.bulk_create(cards, ignore_conflicts=True)
+
+    def _report(self, name, keys, lookup):
+        timings = []
+        for number, expire in keys:
+            start = time.perf_counter()
+            lookup(number, expire)
+            timings.append((time.perf_counter() - start) * 1000)
+        percentiles = statistics.quantiles(timings, n=100)
+        self.stdout.write(
+            f"{name:>12}: p50={percentiles[49]:.3f}ms p99={percentiles[98]:.3f}ms "
+            f"({len(timings) / (sum(timings) / 1000):.0f} lookups/sec)"
+        )
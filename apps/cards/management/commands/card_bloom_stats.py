@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+from apps.cards.bloom import BLOOM_FPR, card_filter_stats
+
+
+class Command(BaseCommand):
+    """
+        Builds the card number Bloom filter the way the web workers do and
+        prints its size and accuracy figures.
+
+        Example usage:
+          python manage.py card_bloom_stats
+    """
+
+    help = "Show the size and false-positive rate of the card number Bloom filter"
+
+    def handle(self, *args, **options):
+        stats = card_filter_stats()
+        self.stdout.write(f"Cards:               {stats['cards']}")
+        self.stdout.write(f"Bits / hashes:       {stats['bits']} / {stats['hashes']}")
+        self.stdout.write(f"Memory:              {stats['memory_bytes'] / 1024 / 1024:.2f} MiB")
+        self.stdout.write(
+            f"False-positive rate: {stats['false_positive_rate']:.6f} (target {BLOOM_FPR})"
+        )
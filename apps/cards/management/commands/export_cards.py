@@ -1,11 +1,24 @@
-import csv
-from django.core.management.base import BaseCommand
-from apps.cards.models import Card
+import time
+
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management.base import BaseCommand, CommandError
+from apps.cards.export import FORMATS, export_cards
 
 
 class Command(BaseCommand):
     """
-        Management command that exports card data into a CSV file.
+        Management command that exports card data into a file.
+
+        Cards are streamed from the database with a server-side cursor
+        (.iterator() over a values_list projection), so no model instances are
+        built and memory stays flat whatever the number of cards is. Rows are
+        written in batches of --chunk-size.
+
+        With --workers N the card table is split into primary key ranges that
+        are exported by N processes, and the parts are concatenated
+        (or bundled into a tar file with --archive).
+
+        Formats: csv, csv.gz, jsonl, parquet (parquet requires pyarrow).
 
         You can optionally filter results by:
           --status       (active, inactive, expired)
@@ -14,37 +27,49 @@ class Command(BaseCommand):
 
         Example usage:
           python manage.py export_cards --status=active --phone=99890
+          python manage.py export_cards --format=csv.gz --workers=8 --output=/tmp/cards.csv.gz
+          python manage.py export_cards --format=parquet --workers=8 --archive
     """
 
-    help = "Export cards to CSV with optional filters"
+    help = "Export cards to CSV, gzip CSV, JSON Lines or Parquet with optional filters"
 
     def add_arguments(self, parser):
         parser.add_argument("--status", type=str, help="Filter by status (active, inactive, expired)")
         parser.add_argument("--card_number", type=str, help="Filter by card number")
         parser.add_argument("--phone", type=str, help="Filter by phone")
+        parser.add_argument("--format", choices=list(FORMATS), default="csv", help="Output format")
+        parser.add_argument("--gzip", action="store_true", help="Shortcut for --format=csv.gz")
+        parser.add_argument("--output", type=str, help="Output file (default: cards_export.<format>)")
+        parser.add_argument("--workers", type=int, default=1, help="Number of export processes")
+        parser.add_argument("--archive", action="store_true", help="Bundle the parts into a tar file")
+        parser.add_argument("--chunk-size", type=int, default=5000, help="Rows fetched and written per batch")
 
     def handle(self, *args, **options):
-        queryset = Card.objects.all()
-
-        if options["status"]:
-            queryset = queryset.filter(status=options["status"].lower())
-
-        if options["card_number"]:
-            queryset = queryset.filter(card_number__icontains=options["card_number"].replace(" ", ""))
-
-        if options["phone"]:
-            queryset = queryset.filter(phone__icontains=options["phone"].replace(" ", ""))
-
-        with open("cards_export.csv", "w", newline="") as csvfile:
-            writer = csv.writer(csvfile)
-            writer.writerow(["card_number", "expire", "phone", "status", "balance"])
-            for card in queryset:
-                writer.writerow([
-                    card.format_card_number,
-                    card.format_expire,
-                    card.format_phone,
-                    card.status,
-                    card.balance,
-                ])
-
-        self.stdout.write(self.style.SUCCESS("Cards successfully exported to cards_export.csv"))
+        fmt = "csv.gz" if options["gzip"] else options["format"]
+        output = options["output"] or (
+            "cards_export.tar" if options["archive"] else f"cards_export{FORMATS[fmt]}"
+        )
+        filters = {
+            "status": options["status"],
+            "card_number": options["card_number"],
+            "phone": options["phone"],
+        }
+
+        start = time.perf_counter()
+        try:
+            exported = export_cards(
+                output,
+                fmt=fmt,
+                filters=filters,
+                workers=options["workers"],
+                chunk_size=options["chunk_size"],
+                archive=options["archive"],
+            )
+        except ImproperlyConfigured as e:
+            raise CommandError(str(e))
+
+        elapsed = time.perf_counter() - start
+        rate = exported / elapsed if elapsed else 0
+        self.stdout.write(self.style.SUCCESS(
+            f"{exported} cards successfully exported to {output} in {elapsed:.2f}s ({rate:.0f} rows/sec)"
+        ))
@@ -1 +1,2 @@
 from .card import Card
+from .ledger import LedgerEntry, BalanceSnapshot
@@ -1,6 +1,49 @@
 from django.db import models
 from django.utils.translation import gettext_lazy as _
 from apps.utils.models.base_model import BaseModel
+from apps.utils.services import parse_expire
+
+
+# Columns read by the card_number + expire lookups (card info, transfer validation)
+AUTH_FIELDS = ("id", "card_number", "status", "balance", "phone")
+
+
+class CardQuerySet(models.QuerySet):
+    """
+        QuerySet with card specific lookups.
+    """
+
+    def with_expiry(self, expire: str) -> "CardQuerySet":
+        """
+            Filters cards by expiry date given in any supported format
+            (12/24, 2024-12, 12.2024 ...), using the normalized
+            expire_month/expire_year columns.
+
+            Returns an empty queryset if the expiry date cannot be parsed
+            or is a bare year.
+        """
+        parsed = parse_expire(expire, year_only=False)
+        if parsed is None:
+            return self.none()
+        month, year = parsed
+        return self.filter(expire_month=month, expire_year=year)
+
+    def authenticate(self, card_number: str, expire: str, fields=AUTH_FIELDS) -> "Card | None":
+        """
+            Finds a card by number and expiry date (card authentication).
+
+            card_number is unique, so the lookup is a seek on its index (the
+            expiry is checked on the one row found), and only `fields` are
+            loaded, so callers do not pay for columns they never read.
+
+            Returns:
+                Card | None: The card (deferred model instance) or None if the
+                number and expiry date do not match any card.
+        """
+        try:
+            return self.with_expiry(expire).only(*fields).get(card_number=card_number)
+        except self.model.DoesNotExist:
+            return None
 
 
 class Card(BaseModel):
@@ -29,6 +72,20 @@ class Card(BaseModel):
         verbose_name=_("Expiry Date"),
         help_text=_("Card expiry date in flexible formats (e.g. 12/24, 12/2024, 2024-12).")
     )
+    expire_month = models.PositiveSmallIntegerField(
+        null=True,
+        blank=True,
+        editable=False,
+        verbose_name=_("Expiry Month"),
+        help_text=_("Month parsed from the expiry date, filled on save.")
+    )
+    expire_year = models.PositiveSmallIntegerField(
+        null=True,
+        blank=True,
+        editable=False,
+        verbose_name=_("Expiry Year"),
+        help_text=_("Four-digit year parsed from the expiry date, filled on save.")
+    )
     phone = models.CharField(
         max_length=13,
         blank=True,
@@ -50,9 +107,14 @@ class Card(BaseModel):
         help_text=_("Current balance of the card account.")
     )
 
+    objects = CardQuerySet.as_manager()
+
     class Meta:
         verbose_name = _("Card")
         verbose_name_plural = _("Cards")
+        indexes = [
+            models.Index(fields=["expire_year", "expire_month"], name="card_expire_year_month_idx"),
+        ]
 
     def __str__(self) -> str:
         """
@@ -65,7 +127,30 @@ class Card(BaseModel):
         """
         return f"{self.format_card_number} ({self.status})"
 
+    def set_expire_parts(self) -> None:
+        """
+            Fills expire_month/expire_year from the free-form `expire` value
+            (both None if it cannot be parsed).
+        """
+        self.expire_month, self.expire_year = parse_expire(self.expire) or (None, None)
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Card number as stored (None if not loaded), so the post_save
+        # receivers can tell whether a save changed it (apps.cards.signals)
+        instance._stored_card_number = instance.__dict__.get("card_number")
+        return instance
+
+    def save(self, *args, **kwargs):
+        """
+            Keeps the normalized expiry columns in sync with `expire`.
+        """
+        self.set_expire_parts()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "expire" in update_fields:
+            kwargs["update_fields"] = {*update_fields, "expire_month", "expire_year"}
+        super().save(*args, **kwargs)
 
     @property
     def format_card_number(self) -> str:
@@ -114,6 +199,9 @@ class Card(BaseModel):
             Returns:
                 str: Normalized expiry date or "-" if missing.
         """
+        if self.expire_month and self.expire_year:
+            return f"{self.expire_month:02d}/{self.expire_year % 100:02d}"
+
         if not self.expire:
             return "-"
 
@@ -0,0 +1,86 @@
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+from apps.utils.models.base_model import BaseModel
+
+
+class LedgerEntry(BaseModel):
+    """
+        Append-only, double-entry record of a balance movement on a card.
+
+        Every confirmed transfer writes two entries: a negative one (debit) for
+        the sender card and a positive one (credit) for the receiver card.
+        Entries are never updated, except for the `applied` flag of deferred
+        credits (see apps.cards.ledger.apply_pending_credits).
+    """
+
+    card = models.ForeignKey(
+        "cards.Card",
+        on_delete=models.PROTECT,
+        related_name="ledger_entries",
+        verbose_name=_("Card"),
+    )
+    transfer_ext_id = models.UUIDField(
+        db_index=True,
+        verbose_name=_("Transfer external ID"),
+        help_text=_("External ID of the transfer that produced this entry."),
+    )
+    amount = models.DecimalField(
+        max_digits=18,
+        decimal_places=2,
+        verbose_name=_("Amount"),
+        help_text=_("Signed amount: negative for debits, positive for credits."),
+    )
+    applied = models.BooleanField(
+        default=True,
+        verbose_name=_("Applied"),
+        help_text=_("Whether the amount is already reflected in Card.balance."),
+    )
+
+    class Meta:
+        db_table = "card_ledger"
+        indexes = [
+            models.Index(fields=["card", "id"]),
+            models.Index(fields=["applied", "card"]),
+        ]
+        verbose_name = _("Ledger entry")
+        verbose_name_plural = _("Ledger entries")
+
+    def __str__(self) -> str:
+        return f"LedgerEntry({self.card_id}, {self.amount}, transfer={self.transfer_ext_id})"
+
+
+class BalanceSnapshot(BaseModel):
+    """
+        Checkpoint of a card's ledger balance.
+
+        The balance of a card is the latest snapshot plus the sum of the
+        ledger entries written after `last_entry_id`.
+    """
+
+    card = models.ForeignKey(
+        "cards.Card",
+        on_delete=models.PROTECT,
+        related_name="balance_snapshots",
+        verbose_name=_("Card"),
+    )
+    balance = models.DecimalField(
+        max_digits=18,
+        decimal_places=2,
+        verbose_name=_("Balance"),
+    )
+    last_entry_id = models.BigIntegerField(
+        verbose_name=_("Last ledger entry ID"),
+        help_text=_("ID of the last ledger entry included in this snapshot."),
+    )
+
+    class Meta:
+        db_table = "card_balance_snapshots"
+        indexes = [
+            models.Index(fields=["card", "-last_entry_id"]),
+            models.Index(fields=["last_entry_id"]),
+        ]
+        verbose_name = _("Balance snapshot")
+        verbose_name_plural = _("Balance snapshots")
+
+    def __str__(self) -> str:
+        return f"BalanceSnapshot({self.card_id}, {self.balance}, upto={self.last_entry_id})"
@@ -12,10 +12,25 @@ class CardInfoRequestSerializer(serializers.Serializer):
                                Maximum length is 19 characters.
                                Example: '8600123456789012'
             expire (str): A string field that represents the card's expiration date.
-                          Usually in MM/YY format. Example: '12/25'
+                          Any format parse_expire accepts, up to 10 characters.
+                          Example: '12/25', '2027-12'
     """
     card_number = serializers.CharField(max_length=19)
-    expire = serializers.CharField(max_length=5)
+    expire = serializers.CharField(max_length=10)
+
+
+class CardInfoBulkRequestSerializer(serializers.Serializer):
+    """
+        Serializer for batch card information requests.
+
+        Only the envelope is validated here; every item is validated
+        separately with CardInfoRequestSerializer, so one bad item does not
+        fail the whole batch.
+
+        Fields:
+            cards (list[dict]): Up to 50 {"card_number": ..., "expire": ...} items.
+    """
+    cards = serializers.ListField(child=serializers.DictField(), min_length=1, max_length=50)
 
 # example usage
 # data = {"card_number": "8600123412341234", "expire": "12/25"}
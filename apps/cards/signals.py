@@ -0,0 +1,31 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from apps.cards.bloom import register_cards
+from apps.cards.cache import bump_card_versions
+from apps.cards.models import Card
+
+
+@receiver(post_save, sender=Card)
+@receiver(post_delete, sender=Card)
+def card_changed(sender, instance, **kwargs):
+    """
+        Invalidates the cached card info whenever a Card row changes.
+    """
+    bump_card_versions(instance.card_number)
+
+
+@receiver(post_save, sender=Card)
+def card_number_saved(sender, instance, created, **kwargs):
+    """
+        Adds the card number to the card number Bloom filter whenever a save
+        writes a new one (card created, or its number changed), and
+        invalidates the cached card info of the previous number.
+        If the stored number is unknown (not loaded), it is registered anyway.
+    """
+    stored = getattr(instance, "_stored_card_number", None)
+    if created or stored != instance.card_number:
+        register_cards(instance.card_number)
+        if stored is not None:
+            bump_card_versions(stored)
+    instance._stored_card_number = instance.card_number
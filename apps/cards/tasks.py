@@ -1,51 +1,244 @@
-from celery import shared_task
-from openpyxl import load_workbook
-from .models import Card
+import os
+import time
 
-@shared_task
-def import_cards_from_excel_task(file_path):
+from celery import chord, group, shared_task, uuid
+from celery.result import AsyncResult, GroupResult
+from django.core.cache import cache
+from apps.utils.stats import recount_cards
+from .excel_import import (
+    PARALLEL_THRESHOLD,
+    count_data_rows,
+    import_cards_from_chunk_file,
+    import_cards_from_excel,
+    merge_import_results,
+    merge_reject_files,
+    rejects_path_for,
+    split_into_chunk_files,
+)
+from .ledger import apply_pending_credits, take_snapshots
+
+CACHE_KEY_CARD_IMPORT = "card_import:{task_id}"
+IMPORT_STATUS_TTL = 60 * 60 * 24
+
+
+def _progress_reporter(task, total):
+    """
+        Returns an import_rows progress callback that publishes a PROGRESS
+        state (with the running counters) to the result backend.
+    """
+    def report(processed, imported, rejected):
+        task.update_state(state="PROGRESS", meta={
+            "processed": processed,
+            "imported": imported,
+            "rejected": rejected,
+            "total": total,
+        })
+    return report
+
+
+@shared_task(bind=True)
+def import_cards_from_excel_task(self, file_path, total=None):
     """
         Imports card data from an Excel file in the background using Celery.
 
+        The file is streamed in read-only mode and cards are written with
+        chunked bulk upserts (see apps.cards.excel_import), so memory stays
+        bounded by the chunk size whatever the file size is. Progress is
+        published after every chunk, rejected rows are written to a CSV report.
+        The card counter is recounted at the end (even after a failure, the
+        chunks written until then are committed).
+
         Parameters:
             file_path (str): The full path to the Excel file on the server.
+            total (int | None): Number of data rows, if known, used for the ETA.
 
         Returns:
             dict: A summary of the import results, including the number of successfully imported
-                  records, rejected records, or an error message if the process fails.
+                  records, rejected records, the rejected rows report and throughput (rows_per_sec),
+                  or an error message if the process fails.
+    """
+    try:
+        result = import_cards_from_excel(
+            file_path,
+            rejects_path=rejects_path_for(file_path),
+            progress=_progress_reporter(self, total),
+        )
+    except Exception as e:
+        result = {"error": str(e)}
+    recount_cards()
+    return result
+
+
+@shared_task(bind=True)
+def import_cards_chunk_task(self, chunk_path, header, min_row, max_row, rejects_path):
+    """
+        Imports one row range of an Excel file (one part of a parallel import)
+        from the JSON lines file the dispatcher wrote for it, then removes the file.
+
+        Parameters:
+            chunk_path (str): The range's rows; it must be readable by every worker.
+            header (list[str]): Lower-cased column names of the worksheet.
+            min_row (int): Worksheet row of the first line.
+            max_row (int): Worksheet row of the last line.
+            rejects_path (str): Where to write the range's rejected rows report.
+
+        Returns:
+            dict: The import summary of the range, or an error message.
+    """
+    total = max_row - min_row + 1
+    try:
+        result = import_cards_from_chunk_file(
+            chunk_path,
+            header,
+            min_row,
+            rejects_path=rejects_path,
+            progress=_progress_reporter(self, total),
+        )
+    except Exception as e:
+        return {"error": f"rows {min_row}-{max_row}: {e}", "total": total}
+    finally:
+        if os.path.exists(chunk_path):
+            os.remove(chunk_path)
+    result["total"] = total
+    return result
+
+
+@shared_task
+def dispatch_card_import_task(file_path, started_at, callback_id):
+    """
+        Dispatcher of a parallel import: parses the workbook once, writing its
+        row ranges into JSON lines files, and starts one import_cards_chunk_task
+        per range with merge_import_results_task (task id `callback_id`) as the
+        chord callback. The group of range tasks is saved in the result backend
+        and recorded in the import's cache entry, for get_import_progress().
     """
-    imported, rejected = 0, 0
     try:
-        wb = load_workbook(file_path)
-        ws = wb.active
-        rows = list(ws.iter_rows(values_only=True))
-        header = [h.lower() for h in rows[0]]
-
-        for row in rows[1:]:
-            data = dict(zip(header, row))
-            try:
-                card_number = str(data.get("card_number", "")).strip()
-                expire = str(data.get("expire", "")).strip()
-                phone = str(data.get("phone", "")).strip()
-                status = str(data.get("status", "")).lower()
-                balance = float(data.get("balance") or 0)
-
-                if status not in [s.value for s in Card.Status]:
-                    raise ValueError("Invalid status")
-
-                Card.objects.update_or_create(
-                    card_number=card_number,
-                    defaults={
-                        "expire": expire,
-                        "phone": phone,
-                        "status": status,
-                        "balance": balance,
-                    },
-                )
-                imported += 1
-            except Exception:
-                rejected += 1
-        return {"imported": imported, "rejected": rejected}
+        header, chunks = split_into_chunk_files(file_path)
     except Exception as e:
-        return {"error": str(e)}
+        merge_import_results_task.apply_async(([{"error": str(e)}], file_path, started_at), task_id=callback_id)
+        return
+    tasks = group(
+        import_cards_chunk_task.s(chunk_path, header, min_row, max_row, rejects_path_for(file_path, min_row, max_row))
+        for chunk_path, min_row, max_row in chunks
+    )
+    result = chord(tasks)(merge_import_results_task.s(file_path, started_at).set(task_id=callback_id))
+    if result.parent is not None:  # no header group result in eager mode
+        result.parent.save()
+        key = CACHE_KEY_CARD_IMPORT.format(task_id=callback_id)
+        meta = cache.get(key) or {}
+        cache.set(key, {**meta, "group_id": result.parent.id}, timeout=IMPORT_STATUS_TTL)
+
+
+@shared_task
+def merge_import_results_task(results, file_path, started_at):
+    """
+        Chord callback of a parallel import: merges the per-range summaries
+        and the per-range rejected rows reports, and recounts the cards
+        (apps.utils.stats.recount_cards) once every range has been written.
+
+        Parameters:
+            results (list[dict]): Results of import_cards_chunk_task.
+            file_path (str): The full path to the imported Excel file.
+            started_at (float): Unix time when the import was started.
 
+        Returns:
+            dict: Total imported/rejected counters, reject reasons, chunk errors,
+                  the rejected rows report and throughput.
+    """
+    merged = merge_import_results(results)
+    recount_cards()
+    merged["rejects_file"] = merge_reject_files(
+        [result.get("rejects_file") for result in results],
+        rejects_path_for(file_path),
+    )
+    elapsed = time.time() - started_at
+    merged["chunks"] = len(results)
+    merged["elapsed"] = round(elapsed, 3)
+    merged["rows_per_sec"] = round(merged["processed"] / elapsed, 1) if elapsed else None
+    return merged
+
+
+def start_card_import(file_path):
+    """
+        Starts the import of an uploaded Excel file.
+
+        Small files (or files without declared dimensions) are imported by a
+        single task. Larger files go to dispatch_card_import_task, which
+        parses the workbook once, splits it into row ranges imported by their
+        own tasks, and a chord callback merges their results. The import is
+        registered in the cache (the dispatcher adds the group of range
+        tasks), so get_import_progress() can add up the progress of its tasks.
+
+        Returns:
+            AsyncResult: Result of the single import task or of the chord callback.
+    """
+    data_rows = count_data_rows(file_path)
+    started_at = time.time()
+    parallel = data_rows is not None and data_rows > PARALLEL_THRESHOLD
+    task_id = uuid()
+    # Registered before the tasks run, so the dispatcher can add the group id
+    cache.set(
+        CACHE_KEY_CARD_IMPORT.format(task_id=task_id),
+        {"group_id": None, "total": data_rows, "started_at": started_at},
+        timeout=IMPORT_STATUS_TTL,
+    )
+    if parallel:
+        dispatch_card_import_task.delay(file_path, started_at, task_id)
+    else:
+        import_cards_from_excel_task.apply_async((file_path,), {"total": data_rows}, task_id=task_id)
+    return AsyncResult(task_id)
+
+
+def get_import_progress(task_id):
+    """
+        Collects the state of an import started by start_card_import().
+
+        Returns:
+            dict: {"state", "processed", "total", "rows_per_sec", "eta"} while the
+                  import is running; {"state", "result"} once it is done.
+    """
+    result = AsyncResult(task_id)
+    if result.ready():
+        return {"state": result.state, "result": result.result if result.successful() else str(result.result)}
+
+    meta = cache.get(CACHE_KEY_CARD_IMPORT.format(task_id=task_id)) or {}
+    parts = [result]
+    if meta.get("group_id"):
+        group_result = GroupResult.restore(meta["group_id"])
+        parts = group_result.results if group_result is not None else []
+
+    processed = sum(part.info.get("processed", 0) for part in parts if isinstance(part.info, dict))
+    total = meta.get("total")
+    elapsed = time.time() - meta["started_at"] if meta.get("started_at") else 0
+    rows_per_sec = round(processed / elapsed, 1) if elapsed and processed else None
+    eta = round((total - processed) / rows_per_sec) if rows_per_sec and total else None
+    return {
+        "state": "PROGRESS" if processed else result.state,
+        "processed": processed,
+        "total": total,
+        "rows_per_sec": rows_per_sec,
+        "eta": eta,
+    }
+
+
+@shared_task
+def apply_ledger_credits_task():
+    """
+        Folds deferred ledger credits of hot accounts into Card.balance.
+
+        Returns:
+            dict: Number of ledger entries applied.
+    """
+    return {"applied": apply_pending_credits()}
+
+
+@shared_task
+def snapshot_card_balances_task():
+    """
+        Writes balance snapshots for cards with new ledger entries and
+        reports cards whose Card.balance drifted from the ledger.
+
+        Returns:
+            dict: Snapshot/drift counters (see apps.cards.ledger.take_snapshots).
+    """
+    return take_snapshots()
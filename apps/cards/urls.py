@@ -1,6 +1,7 @@
 from django.urls import path
-from apps.cards.views import CardInfoView
+from apps.cards.views import CardInfoBulkView, CardInfoView
 
 urlpatterns = [
-    path('card-info/', CardInfoView.as_view(), name='card-info')
+    path('card-info/', CardInfoView.as_view(), name='card-info'),
+    path('card-info/bulk/', CardInfoBulkView.as_view(), name='card-info-bulk'),
 ]
\ No newline at end of file
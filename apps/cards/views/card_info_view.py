@@ -1,9 +1,12 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
-from django.core.cache import cache
-from apps.cards.models import Card
-from apps.cards.serializers import CardInfoRequestSerializer, CardInfoResponseSerializer
+from apps.cards.cache import get_card_info, get_card_infos
+from apps.cards.serializers import (
+    CardInfoBulkRequestSerializer,
+    CardInfoRequestSerializer,
+    CardInfoResponseSerializer,
+)
 from apps.utils.decorators.logging_decorator import track_method
 
 
@@ -15,12 +18,14 @@ class CardInfoView(APIView):
 
             Steps:
             1. Validate input using CardInfoRequestSerializer.
-            2. Check cache for existing card info.
-            3. If cached, return cached data.
-            4. Query the database for the card by card_number and expire date.
-            5. If found, mask the card number and return status, balance, phone, and masked_card.
-            6. Cache the response for 30 seconds to reduce DB load.
-            7. If not found, return a 404 error and cache the error response.
+            2. Read the card info through the versioned card cache (apps.cards.cache):
+               on a miss only one request queries the database for the card by
+               card_number and expire date, the others wait for its result.
+            3. If found, return status, balance, phone, and masked_card.
+            4. If not found, return a 404 error (the miss is cached as well).
+
+            Cached entries are invalidated as soon as the card changes
+            (its cache version is bumped), so balances are never stale.
         """
         serializer = CardInfoRequestSerializer(data=request.data)
         if not serializer.is_valid():
@@ -28,27 +33,47 @@ class CardInfoView(APIView):
 
         card_number = serializer.validated_data['card_number']
         expire = serializer.validated_data['expire']
-        cache_key = f"card_info:{card_number}:{expire}"
-
-        cached_data = cache.get(cache_key)
-        if cached_data:
-            return Response(cached_data)
-
-        try:
-            card = Card.objects.get(card_number=card_number, expire=expire)
-            response_data = {
-                "card_status": card.status,
-                "balance": card.balance,
-                "phone": card.phone,
-                "masked_card": f"{card.card_number[:6]}******{card.card_number[-4:]}"
-            }
-
-            cache.set(cache_key, response_data, timeout=30)
-
-            response_serializer = CardInfoResponseSerializer(response_data)
-            return Response(response_serializer.data)
-
-        except Card.DoesNotExist:
-            error_response = {"error": "Card not found"}
-            cache.set(cache_key, error_response, timeout=30)
-            return Response(error_response, status=status.HTTP_404_NOT_FOUND)
+
+        response_data = get_card_info(card_number, expire)
+        if response_data is None:
+            return Response({"error": "Card not found"}, status=status.HTTP_404_NOT_FOUND)
+
+        response_serializer = CardInfoResponseSerializer(response_data)
+        return Response(response_serializer.data)
+
+
+class CardInfoBulkView(APIView):
+    @track_method('post')
+    def post(self, request):
+        """
+            Handle POST request to retrieve information about several cards at once
+            (e.g. all cards of a wallet).
+
+            Request:
+                {"cards": [{"card_number": "...", "expire": "12/25"}, ...]}
+
+            Steps:
+            1. Validate the envelope, then each item with CardInfoRequestSerializer.
+            2. Look all valid items up together (apps.cards.cache.get_card_infos):
+               one cache read for all of them and one database query for the misses.
+            3. Return one result per item, in request order: the card info,
+               or {"error": ...} for invalid or unknown items.
+        """
+        serializer = CardInfoBulkRequestSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        results, lookups = [], []
+        for item in serializer.validated_data['cards']:
+            item_serializer = CardInfoRequestSerializer(data=item)
+            if item_serializer.is_valid():
+                lookups.append((len(results), item_serializer.validated_data))
+                results.append(None)
+            else:
+                results.append({"error": item_serializer.errors})
+
+        infos = get_card_infos([(data['card_number'], data['expire']) for _, data in lookups])
+        for (index, _), info in zip(lookups, infos):
+            results[index] = CardInfoResponseSerializer(info).data if info is not None else {"error": "Card not found"}
+
+        return Response({"results": results})
@@ -1,7 +1,49 @@
 from django.contrib import admin
 from apps.transfers.models.transfer_models import Transfer
+from apps.transfers.models.rollup_models import TransferRollup
+from apps.transfers.models.archive_models import ArchivedTransfer
 
 
 @admin.register(Transfer)
 class TransferAdmin(admin.ModelAdmin):
-    list_display = ('id',"ext_id")
\ No newline at end of file
+    list_display = ('id',"ext_id")
+
+
+@admin.register(TransferRollup)
+class TransferRollupAdmin(admin.ModelAdmin):
+    """
+        O'tkazmalar statistikasi (soatlik/kunlik), faqat o'qish uchun.
+    """
+    list_display = ('period', 'bucket', 'currency', 'state', 'count', 'sending_total', 'receiving_total')
+    list_filter = ('period', 'currency', 'state')
+    date_hierarchy = 'bucket'
+    ordering = ('-bucket',)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(ArchivedTransfer)
+class ArchivedTransferAdmin(admin.ModelAdmin):
+    """
+        Arxivlangan o'tkazmalar (faqat o'qish uchun), ext_id bo'yicha qidiruv.
+    """
+    list_display = ('transfer_id', 'ext_id', 'state', 'sending_amount', 'currency', 'created_at', 'archive_month')
+    list_filter = ('state', 'currency', 'archive_month')
+    search_fields = ('=ext_id',)
+    show_full_result_count = False
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
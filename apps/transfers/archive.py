@@ -0,0 +1,128 @@
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from apps.transfers.models.archive_models import ArchivedTransfer
+from apps.transfers.models.transfer_models import Transfer
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_STATES = (Transfer.State.CONFIRMED, Transfer.State.CANCELLED)
+
+# Confirmed/cancelled transfers older than this many days are archived
+ARCHIVE_AFTER_DAYS = getattr(settings, 'TRANSFER_ARCHIVE_AFTER_DAYS', 90)
+# Transfers moved per transaction
+ARCHIVE_BATCH_SIZE = getattr(settings, 'TRANSFER_ARCHIVE_BATCH_SIZE', 5000)
+
+ARCHIVED_FIELDS = (
+    'ext_id', 'sender_card_number', 'receiver_card_number', 'sender_card_expiry',
+    'sender_phone', 'receiver_phone', 'sending_amount', 'currency', 'receiving_amount',
+    'state', 'cancelled_at', 'created_at', 'updated_at', 'created_by_id', 'updated_by_id',
+)
+
+
+def to_archive(transfer: Transfer) -> ArchivedTransfer:
+    return ArchivedTransfer(
+        transfer_id=transfer.pk,
+        archive_month=transfer.created_at.date().replace(day=1),
+        **{field: getattr(transfer, field) for field in ARCHIVED_FIELDS},
+    )
+
+
+def archive_batch(cutoff, batch_size: int = ARCHIVE_BATCH_SIZE) -> int:
+    """
+        Moves up to `batch_size` confirmed/cancelled transfers created before
+        `cutoff` into the archive table, in one transaction.
+
+        The batch is selected through the (state, created_at) index and locked
+        (rows locked by a running request are skipped). The archive insert
+        fails on any conflict, which rolls the whole batch back, so no
+        original is deleted without its copy.
+
+        Returns:
+            int: Number of archived transfers.
+    """
+    with transaction.atomic():
+        transfers = list(
+            Transfer.objects.select_for_update(skip_locked=True)
+            .filter(state__in=TERMINAL_STATES, created_at__lt=cutoff)
+            .order_by('created_at')[:batch_size]
+        )
+        if not transfers:
+            return 0
+        ArchivedTransfer.objects.bulk_create([to_archive(transfer) for transfer in transfers])
+        # Plain DELETE instead of QuerySet.delete(): no per-row post_delete, so
+        # archived transfers stay counted in the system statistics
+        # (apps.utils.stats) and in the rollups, which include the archive table.
+        pks = [transfer.pk for transfer in transfers]
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"DELETE FROM {connection.ops.quote_name(Transfer._meta.db_table)} "
+                f"WHERE id IN ({', '.join(['%s'] * len(pks))})",
+                pks,
+            )
+    return len(transfers)
+
+
+def archive_transfers(older_than_days: int = ARCHIVE_AFTER_DAYS, batch_size: int = ARCHIVE_BATCH_SIZE,
+                      max_batches: int = None, progress=None) -> int:
+    """
+        Archives confirmed/cancelled transfers older than `older_than_days`
+        days, batch by batch, until none is left (or `max_batches` ran).
+
+        Args:
+            older_than_days (int): Age (by created_at) from which transfers are archived.
+            batch_size (int): Transfers moved per transaction.
+            max_batches (int): Stop after this many batches (None: no limit).
+            progress (callable): Called with the running total after each batch.
+
+        Returns:
+            int: Number of archived transfers.
+    """
+    cutoff = timezone.now() - timedelta(days=older_than_days)
+    total, batches = 0, 0
+    while max_batches is None or batches < max_batches:
+        moved = archive_batch(cutoff, batch_size)
+        if not moved:
+            break
+        total += moved
+        batches += 1
+        if progress:
+            progress(total)
+
+    if total:
+        logger.info(f"[ARCHIVE] Archived {total} transfers created before {cutoff.isoformat()}")
+    return total
+
+
+def find_transfer(transfer_id=None, ext_id=None):
+    """
+        Looks a transfer up by id or ext_id in the transfers table, then in
+        the archive. Archived transfers are always confirmed or cancelled, so
+        callers that need a "created" transfer reject them by state.
+
+        Returns:
+            Transfer | ArchivedTransfer
+
+        Raises:
+            Transfer.DoesNotExist: If neither table has the transfer.
+    """
+    lookup = {'pk': transfer_id} if transfer_id else {'ext_id': ext_id}
+    try:
+        return Transfer.objects.get(**lookup)
+    except Transfer.DoesNotExist:
+        archived_lookup = {'transfer_id': transfer_id} if transfer_id else {'ext_id': ext_id}
+        archived = ArchivedTransfer.objects.filter(**archived_lookup).first()
+        if archived is None:
+            raise Transfer.DoesNotExist
+        return archived
+
+
+def transfer_exists(ext_id) -> bool:
+    """
+        Whether an ext_id is used by a live or an archived transfer.
+    """
+    return Transfer.objects.filter(ext_id=ext_id).exists() or ArchivedTransfer.objects.filter(ext_id=ext_id).exists()
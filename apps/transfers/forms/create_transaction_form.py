@@ -1,5 +1,6 @@
 from django import forms
 from django.utils.translation import gettext_lazy as _
+from apps.transfers.archive import find_transfer
 from apps.transfers.models.transfer_models import Transfer
 from apps.utils.validations import TransferValidationMixin
 
@@ -143,19 +144,12 @@ class ConfirmTransferForm(TransferValidationMixin, forms.Form):
         transfer_id = cleaned_data.get('transfer_id')
         ext_id = cleaned_data.get('ext_id')
 
-        transfer = None
-        if transfer_id:
-            try:
-                transfer = Transfer.objects.get(id=transfer_id)
-            except Transfer.DoesNotExist:
-                raise forms.ValidationError(_('Transfer not found'))
-        elif ext_id:
-            try:
-                transfer = Transfer.objects.get(ext_id=ext_id)
-            except Transfer.DoesNotExist:
-                raise forms.ValidationError(_('Transfer not found'))
-        else:
+        if not transfer_id and not ext_id:
             raise forms.ValidationError(_('Either transfer_id or ext_id is required'))
+        try:
+            transfer = find_transfer(transfer_id=transfer_id, ext_id=ext_id)
+        except Transfer.DoesNotExist:
+            raise forms.ValidationError(_('Transfer not found'))
 
         if transfer.state != Transfer.State.CREATED:
             raise forms.ValidationError(_('Transfer is not in created state'))
@@ -190,19 +184,12 @@ class CancelTransferForm(forms.Form):
         transfer_id = cleaned_data.get('transfer_id')
         ext_id = cleaned_data.get('ext_id')
 
-        transfer = None
-        if transfer_id:
-            try:
-                transfer = Transfer.objects.get(id=transfer_id)
-            except Transfer.DoesNotExist:
-                raise forms.ValidationError(_('Transfer not found'))
-        elif ext_id:
-            try:
-                transfer = Transfer.objects.get(ext_id=ext_id)
-            except Transfer.DoesNotExist:
-                raise forms.ValidationError(_('Transfer not found'))
-        else:
+        if not transfer_id and not ext_id:
             raise forms.ValidationError(_('Either transfer_id or ext_id is required'))
+        try:
+            transfer = find_transfer(transfer_id=transfer_id, ext_id=ext_id)
+        except Transfer.DoesNotExist:
+            raise forms.ValidationError(_('Transfer not found'))
 
         if transfer.state != Transfer.State.CREATED:
             raise forms.ValidationError(_('Only created transfers can be cancelled'))
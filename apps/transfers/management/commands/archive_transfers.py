@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.transfers.archive import ARCHIVE_AFTER_DAYS, ARCHIVE_BATCH_SIZE, archive_transfers
+
+
+class Command(BaseCommand):
+    """
+        Moves confirmed/cancelled transfers older than --days days from the
+        transfers table into the archive table, --batch-size rows per
+        transaction. The nightly beat job does the same with the default
+        settings; use the command for the first large run, e.g. limited with
+        --max-batches to spread it over several maintenance windows.
+
+        Example usage:
+          python manage.py archive_transfers --days=90 --batch-size=5000 --max-batches=100
+    """
+
+    help = "Archive old confirmed/cancelled transfers in bulk batches"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=ARCHIVE_AFTER_DAYS, help="Archive transfers older than this")
+        parser.add_argument("--batch-size", type=int, default=ARCHIVE_BATCH_SIZE, help="Transfers per transaction")
+        parser.add_argument("--max-batches", type=int, default=None, help="Stop after this many batches")
+
+    def handle(self, *args, **options):
+        if options["days"] < 1 or options["batch_size"] < 1:
+            raise CommandError("--days and --batch-size must be at least 1")
+
+        def progress(total):
+            self.stdout.write(f"  {total} archived")
+
+        total = archive_transfers(
+            older_than_days=options["days"],
+            batch_size=options["batch_size"],
+            max_batches=options["max_batches"],
+            progress=progress,
+        )
+        self.stdout.write(self.style.SUCCESS(f"Archived {total} transfers"))
@@ -0,0 +1,49 @@
+from datetime import datetime, timezone as dt_timezone
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.transfers.rollups import BATCH_HOURS, backfill_rollups
+
+
+class Command(BaseCommand):
+    """
+        Builds the hourly/daily transfer rollups from the transfers table.
+
+        The first beat run backfills everything by itself; run this command
+        to do it ahead of time, or with --since/--until to rebuild a period. Every batch of
+        --batch-hours hours is one short transaction with one range query on
+        transfers.created_at, so it can run next to live traffic.
+
+        Example usage:
+          python manage.py backfill_transfer_rollups
+          python manage.py backfill_transfer_rollups --since=2025-01-01 --until=2025-02-01 --batch-hours=6
+    """
+
+    help = "Backfill the transfer rollup tables in bounded batches"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--since", type=self._date, help="First day (YYYY-MM-DD, UTC), default: oldest transfer")
+        parser.add_argument("--until", type=self._date, help="End day (YYYY-MM-DD, UTC, exclusive), default: now")
+        parser.add_argument("--batch-hours", type=int, default=BATCH_HOURS, help="Hours rebuilt per transaction")
+
+    @staticmethod
+    def _date(value):
+        try:
+            return datetime.strptime(value, "%Y-%m-%d").replace(tzinfo=dt_timezone.utc)
+        except ValueError:
+            raise CommandError(f"Expected a YYYY-MM-DD date, got {value!r}")
+
+    def handle(self, *args, **options):
+        if options["batch_hours"] < 1:
+            raise CommandError("--batch-hours must be at least 1")
+
+        def progress(batch_end, rows):
+            self.stdout.write(f"  up to {batch_end:%Y-%m-%d %H:00}: {rows} hourly rows")
+
+        written = backfill_rollups(
+            since=options["since"],
+            until=options["until"],
+            batch_hours=options["batch_hours"],
+            progress=progress,
+        )
+        self.stdout.write(self.style.SUCCESS(f"Backfilled {written} hourly rollup rows"))
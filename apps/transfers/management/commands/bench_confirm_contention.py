@@ -0,0 +1,122 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from apps.cards.models import Card
+from apps.transfers.models import Transfer
+from apps.transfers.services import confirm_transfer
+from apps.utils.stats import record_cards, record_transfers
+
+BENCH_PREFIX = "999999"
+
+
+class Command(BaseCommand):
+    """
+        Management command that benchmarks concurrent transfer confirmations.
+
+        Two scenarios are measured with the same number of transfers and threads:
+          - hot:  every transfer is sent from ONE sender card (all confirmations
+                  compete for the same row lock)
+          - cold: every transfer has its own sender card (no shared rows)
+
+        Runs on a test database (created like the test runner does, TEST
+        settings of the default database), never on the configured one; the
+        benchmark cards (prefix 999999) are dropped together with it.
+        Use the production database engine (e.g. PostgreSQL); SQLite
+        serializes all writers and will report lock errors.
+
+        Example usage:
+          python manage.py bench_confirm_contention --transfers=2000 --threads=16
+    """
+
+    help = "Benchmark confirmations/sec for one hot sender card vs many cold ones"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--transfers", type=int, default=1000, help="Transfers per scenario")
+        parser.add_argument("--threads", type=int, default=8, help="Concurrent confirming threads")
+
+    def handle(self, *args, **options):
+        transfers = options["transfers"]
+        threads = options["threads"]
+
+        database_name = connection.settings_dict["NAME"]
+        connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            for offset, scenario in enumerate(("hot", "cold")):
+                transfer_ids = self._prepare(scenario, transfers, offset * 2 * transfers)
+                elapsed, confirmed, failed = self._run(transfer_ids, threads)
+                self.stdout.write(self.style.SUCCESS(
+                    f"{scenario:>4}: {confirmed} confirmed, {failed} failed in {elapsed:.2f}s "
+                    f"-> {confirmed / elapsed if elapsed else 0:.1f} confirmations/sec"
+                ))
+        finally:
+            connection.creation.destroy_test_db(database_name, verbosity=0)
+
+    def _prepare(self, scenario, count, first):
+        """
+            Creates sender/receiver cards (numbered from `first`) and `count`
+            transfers in "created" state.
+        """
+        amount = Decimal("1.00")
+        if scenario == "hot":
+            senders = [self._card(first, balance=amount * count)]
+        else:
+            senders = [self._card(first + i, balance=amount) for i in range(count)]
+        receivers = [self._card(first + count + i, balance=Decimal("0")) for i in range(count)]
+        Card.objects.bulk_create(senders + receivers, batch_size=1000)
+        record_cards(len(senders) + len(receivers))
+
+        last_pk = Transfer.objects.order_by("-pk").values_list("pk", flat=True).first() or 0
+        transfers = Transfer.objects.bulk_create([
+            Transfer(
+                sender_card_number=senders[i % len(senders)].card_number,
+                sender_card_expiry="12/99",
+                receiver_card_number=receivers[i].card_number,
+                sending_amount=amount,
+                receiving_amount=amount,
+                currency=643,
+            )
+            for i in range(count)
+        ], batch_size=1000)
+        record_transfers(transfers)
+        return list(
+            Transfer.objects.filter(pk__gt=last_pk).values_list("pk", flat=True)
+        )
+
+    def _run(self, transfer_ids, threads):
+        """
+            Confirms all transfers from a thread pool and returns (elapsed, confirmed, failed).
+        """
+        def worker(chunk):
+            confirmed = 0
+            try:
+                for pk in chunk:
+                    try:
+                        confirm_transfer(Transfer(pk=pk))
+                        confirmed += 1
+                    except Exception:
+                        pass
+            finally:
+                connection.close()
+            return confirmed
+
+        chunks = [transfer_ids[i::threads] for i in range(threads)]
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            confirmed = sum(pool.map(worker, chunks))
+        elapsed = time.perf_counter() - start
+        return elapsed, confirmed, len(transfer_ids) - confirmed
+
+    @staticmethod
+    def _card(index, balance):
+        card = Card(
+            card_number=f"{BENCH_PREFIX}{index:010d}",
+            expire="12/99",
+            status=Card.Status.ACTIVE,
+            balance=balance,
+        )
+        card.set_expire_parts()
+        return card
@@ -0,0 +1,118 @@
+import asyncio
+import json
+import statistics
+import time
+
+import httpx
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.utils.otp_backends import outbox_count
+
+
+class Command(BaseCommand):
+    """
+        Load test for the transfer JSON-RPC endpoint, to compare a WSGI and an
+        ASGI deployment of the same code at equal core counts.
+
+        Sends --requests "transfer.create" calls with --concurrency requests in
+        flight to every --target and reports throughput and p50/p99 latency.
+        Every call issues an OTP. To keep the messaging provider out of the
+        measurement, run the servers with
+        OTP_DELIVERY_BACKEND=apps.utils.otp_backends.LocMemBackend and a shared
+        cache (REDIS_CACHE_URL), and pass --check-otp-outbox to verify that
+        every created transfer handed its code to the backend.
+
+        Start both servers with the same number of processes, e.g.:
+          gunicorn config.wsgi -w 4 --threads 8 -b :8000
+          uvicorn config.asgi:application --workers 4 --port 8001
+
+        Example usage:
+          python manage.py load_test_jsonrpc \\
+            --target wsgi=http://127.0.0.1:8000/transfer/jsonrpc/ \\
+            --target asgi=http://127.0.0.1:8001/transfer/jsonrpc/ \\
+            --sender=8600123412341239 --expiry=12/25 --receiver=8600000000000007 \\
+            --requests=5000 --concurrency=200
+    """
+
+    help = "Compare JSON-RPC throughput and latency of WSGI and ASGI deployments"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--target", action="append", required=True, help="name=url, may be repeated")
+        parser.add_argument("--requests", type=int, default=1000, help="Requests per target")
+        parser.add_argument("--concurrency", type=int, default=100, help="Requests in flight")
+        parser.add_argument("--sender", required=True, help="Sender card number")
+        parser.add_argument("--expiry", required=True, help="Sender card expiry")
+        parser.add_argument("--receiver", required=True, help="Receiver card number")
+        parser.add_argument("--amount", type=int, default=1, help="Amount of every transfer")
+        parser.add_argument("--phone", default="998901234567", help="Sender/receiver phone")
+        parser.add_argument(
+            "--check-otp-outbox", action="store_true",
+            help="Compare created transfers with the codes counted by LocMemBackend",
+        )
+
+    def handle(self, *args, **options):
+        targets = []
+        for target in options["target"]:
+            name, sep, url = target.partition("=")
+            if not sep:
+                raise CommandError(f"--target must look like name=url, got {target!r}")
+            targets.append((name, url))
+
+        for name, url in targets:
+            delivered_before = outbox_count()
+            stats = asyncio.run(self._run(url, options))
+            self.stdout.write(
+                f"{name:>8}: {stats['rps']:.1f} req/s, p50={stats['p50']:.1f}ms p99={stats['p99']:.1f}ms, "
+                f"{stats['errors']} errors / {options['requests']} requests"
+            )
+            if options["check_otp_outbox"]:
+                created = options["requests"] - stats["errors"]
+                delivered = outbox_count() - delivered_before
+                style = self.style.SUCCESS if delivered == created else self.style.ERROR
+                self.stdout.write(style(f"{name:>8}: {delivered} OTPs handed off / {created} transfers created"))
+
+    def _payload(self, index, options):
+        return {
+            "jsonrpc": "2.0",
+            "id": index,
+            "method": "transfer.create",
+            "params": {
+                "sender_card_number": options["sender"],
+                "sender_card_expiry": options["expiry"],
+                "receiver_card_number": options["receiver"],
+                "sending_amount": options["amount"],
+                "currency": 643,
+                "sender_phone": options["phone"],
+                "receiver_phone": options["phone"],
+            },
+        }
+
+    async def _run(self, url, options):
+        semaphore = asyncio.Semaphore(options["concurrency"])
+        latencies, errors = [], 0
+        limits = httpx.Limits(max_connections=options["concurrency"])
+
+        async with httpx.AsyncClient(timeout=60, limits=limits) as client:
+            async def call(index):
+                nonlocal errors
+                async with semaphore:
+                    start = time.perf_counter()
+                    try:
+                        response = await client.post(url, content=json.dumps(self._payload(index, options)))
+                        failed = response.status_code != 200 or "error" in response.json()
+                    except (httpx.HTTPError, ValueError):
+                        failed = True
+                    latencies.append((time.perf_counter() - start) * 1000)
+                    errors += failed
+
+            start = time.perf_counter()
+            await asyncio.gather(*(call(index) for index in range(options["requests"])))
+            elapsed = time.perf_counter() - start
+
+        percentiles = statistics.quantiles(latencies, n=100)
+        return {
+            "rps": len(latencies) / elapsed,
+            "p50": percentiles[49],
+            "p99": percentiles[98],
+            "errors": errors,
+        }
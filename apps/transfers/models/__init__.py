@@ -1 +1,3 @@
-from .transfer_models import Transfer
\ No newline at end of file
+from .transfer_models import Transfer
+from .rollup_models import TransferRollup, RollupWatermark, RollupStaleHour
+from .archive_models import ArchivedTransfer
@@ -0,0 +1,111 @@
+from django.conf import settings
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+
+class ArchivedTransfer(models.Model):
+    """
+        A confirmed or cancelled transfer moved out of the transfers table
+        (see apps.transfers.archive).
+
+        Keeps every Transfer column, audit fields included (the original
+        primary key as `transfer_id`), plus the archive month, which is the natural
+        partition key of this table.
+    """
+
+    transfer_id = models.BigIntegerField(
+        unique=True,
+        verbose_name=_("Transfer ID"),
+    )
+    ext_id = models.UUIDField(
+        unique=True,
+        verbose_name=_("External ID"),
+    )
+    sender_card_number = models.CharField(
+        max_length=16,
+        verbose_name=_("Sender card number"),
+    )
+    receiver_card_number = models.CharField(
+        max_length=16,
+        verbose_name=_("Receiver card number"),
+    )
+    sender_card_expiry = models.CharField(
+        max_length=7,
+        verbose_name=_("Sender card expiry"),
+    )
+    sender_phone = models.CharField(
+        max_length=32,
+        blank=True,
+        null=True,
+        verbose_name=_("Sender phone"),
+    )
+    receiver_phone = models.CharField(
+        max_length=32,
+        blank=True,
+        null=True,
+        verbose_name=_("Receiver phone"),
+    )
+    sending_amount = models.DecimalField(
+        max_digits=18,
+        decimal_places=2,
+        verbose_name=_("Sending amount"),
+    )
+    currency = models.PositiveIntegerField(
+        verbose_name=_("Currency"),
+    )
+    receiving_amount = models.DecimalField(
+        max_digits=18,
+        decimal_places=2,
+        verbose_name=_("Receiving amount"),
+    )
+    state = models.CharField(
+        max_length=10,
+        verbose_name=_("State"),
+    )
+    cancelled_at = models.DateTimeField(
+        blank=True,
+        null=True,
+        verbose_name=_("Cancelled at"),
+    )
+    created_at = models.DateTimeField(
+        verbose_name=_("Created at"),
+    )
+    updated_at = models.DateTimeField(
+        verbose_name=_("Updated at"),
+    )
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        related_name="+",
+        editable=False,
+        null=True,
+        blank=True,
+    )
+    updated_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        related_name="+",
+        editable=False,
+        null=True,
+        blank=True,
+    )
+    archive_month = models.DateField(
+        verbose_name=_("Archive month"),
+        help_text=_("First day of the month the transfer was created in."),
+    )
+    archived_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name=_("Archived at"),
+    )
+
+    class Meta:
+        db_table = "transfers_archive"
+        indexes = [
+            models.Index(fields=["archive_month"]),
+            models.Index(fields=["created_at"]),
+        ]
+        verbose_name = _("Archived transfer")
+        verbose_name_plural = _("Archived transfers")
+
+    def __str__(self):
+        return f"ArchivedTransfer({self.ext_id}, state={self.state})"
@@ -0,0 +1,107 @@
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+
+class TransferRollup(models.Model):
+    """
+        Transfer counts and amounts per (period, currency, state).
+
+        Transfers are grouped by the hour (or day) they were created in and
+        by their current state. Rows are derived from the transfers table by
+        apps.transfers.rollups and can be rebuilt at any time; analytics read
+        them instead of the live table.
+    """
+    class Period(models.TextChoices):
+        HOUR = "hour", _("hour")
+        DAY = "day", _("day")
+
+    period = models.CharField(
+        max_length=4,
+        choices=Period.choices,
+        verbose_name=_("Period"),
+    )
+    bucket = models.DateTimeField(
+        verbose_name=_("Period start"),
+    )
+    currency = models.PositiveIntegerField(
+        verbose_name=_("Currency"),
+    )
+    state = models.CharField(
+        max_length=10,
+        verbose_name=_("State"),
+    )
+    count = models.PositiveIntegerField(
+        default=0,
+        verbose_name=_("Transfers"),
+    )
+    sending_total = models.DecimalField(
+        max_digits=20,
+        decimal_places=2,
+        default=0,
+        verbose_name=_("Sending amount total"),
+    )
+    receiving_total = models.DecimalField(
+        max_digits=20,
+        decimal_places=2,
+        default=0,
+        verbose_name=_("Receiving amount total"),
+    )
+
+    class Meta:
+        db_table = "transfer_rollups"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["period", "bucket", "currency", "state"],
+                name="transfer_rollup_uniq",
+            ),
+        ]
+        verbose_name = _("Transfer rollup")
+        verbose_name_plural = _("Transfer rollups")
+
+    def __str__(self) -> str:
+        return f"TransferRollup({self.period} {self.bucket:%Y-%m-%d %H:00}, {self.currency}, {self.state})"
+
+
+class RollupWatermark(models.Model):
+    """
+        High-water mark of an incremental rollup: rows of the source table
+        changed up to `value` are already reflected in the rollup.
+    """
+
+    name = models.CharField(
+        max_length=50,
+        unique=True,
+        verbose_name=_("Name"),
+    )
+    value = models.DateTimeField(
+        verbose_name=_("Processed up to"),
+    )
+
+    class Meta:
+        db_table = "rollup_watermarks"
+        verbose_name = _("Rollup watermark")
+        verbose_name_plural = _("Rollup watermarks")
+
+    def __str__(self) -> str:
+        return f"{self.name}: {self.value}"
+
+
+class RollupStaleHour(models.Model):
+    """
+        Creation hour of a transfer that was deleted: its rollups must be
+        rebuilt, but the deleted row can no longer be found through the
+        updated_at high-water mark. refresh_rollups() rebuilds the queued
+        hours and removes the rows it processed.
+    """
+
+    bucket = models.DateTimeField(
+        verbose_name=_("Hour start"),
+    )
+
+    class Meta:
+        db_table = "rollup_stale_hours"
+        verbose_name = _("Stale rollup hour")
+        verbose_name_plural = _("Stale rollup hours")
+
+    def __str__(self) -> str:
+        return f"RollupStaleHour({self.bucket:%Y-%m-%d %H:00})"
@@ -88,17 +88,6 @@ class Transfer(BaseModel):
         verbose_name=_("State"),
     )
 
-    try_count = models.PositiveSmallIntegerField(
-        default=0,
-        verbose_name=_("Try count"),
-    )
-    otp = models.CharField(
-        max_length=6,
-        blank=True,
-        null=True,
-        verbose_name=_("OTP"),
-    )
-
     cancelled_at = models.DateTimeField(
         blank=True,
         null=True,
@@ -111,6 +100,9 @@ class Transfer(BaseModel):
             models.Index(fields=["sender_card_number"]),
             models.Index(fields=["receiver_card_number"]),
             models.Index(fields=["state", "created_at"]),
+            # Rollups: changed rows since the high-water mark, rows of an hour
+            models.Index(fields=["updated_at"]),
+            models.Index(fields=["created_at"]),
         ]
         verbose_name = _("Transfer")
         verbose_name_plural = _("Transfers")
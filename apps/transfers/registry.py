@@ -0,0 +1,73 @@
+from dataclasses import dataclass
+from typing import Callable
+
+from django.core.exceptions import ImproperlyConfigured
+from jsonschema import Draft7Validator
+
+
+@dataclass(frozen=True)
+class RpcMethod:
+    """
+    A registered JSON-RPC method.
+
+    Attributes:
+        name (str): Public method name (e.g. 'transfer.create').
+        func (Callable): Handler called as func(params, request_id, **context).
+        validator (Draft7Validator | None): Params validator compiled at import time.
+    """
+    name: str
+    func: Callable
+    validator: Draft7Validator | None = None
+
+    def validate(self, params) -> list[str]:
+        """
+        Checks params against the method schema before any form is built.
+
+        Returns:
+            list[str]: Human readable schema violations (empty when params are valid).
+        """
+        if self.validator is None:
+            return []
+        return [
+            f"{'.'.join(str(p) for p in error.absolute_path) or 'params'}: {error.message}"
+            for error in self.validator.iter_errors(params)
+        ]
+
+
+METHODS: dict[str, RpcMethod] = {}
+
+
+def rpc_method(*names: str, schema: dict | None = None):
+    """
+    Decorator that registers a function as a JSON-RPC method under one or more names.
+
+    The params schema is checked and compiled once, when the decorated module is imported,
+    so dispatch is a single dict lookup followed by validation.
+
+    Example:
+        @rpc_method('cancel', 'transfer.cancel', schema=CANCEL_TRANSFER_SCHEMA)
+        def cancel_transfer_jsonrpc(params, request_id, **context):
+            ...
+    """
+    validator = None
+    if schema is not None:
+        Draft7Validator.check_schema(schema)
+        validator = Draft7Validator(schema)
+
+    def decorator(func):
+        for name in names:
+            if name in METHODS:
+                raise ImproperlyConfigured(f"JSON-RPC method '{name}' is already registered")
+            METHODS[name] = RpcMethod(name=name, func=func, validator=validator)
+        return func
+
+    return decorator
+
+
+def get_method(name) -> RpcMethod | None:
+    """
+    Returns the registered method for the given name, or None if it is unknown.
+    """
+    if not isinstance(name, str):
+        return None
+    return METHODS.get(name)
@@ -0,0 +1,224 @@
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncDay, TruncHour
+from django.utils import timezone
+
+from apps.transfers.models.archive_models import ArchivedTransfer
+from apps.transfers.models.rollup_models import RollupStaleHour, RollupWatermark, TransferRollup
+from apps.transfers.models.transfer_models import Transfer
+
+logger = logging.getLogger(__name__)
+
+WATERMARK_NAME = 'transfer_rollups'
+
+# Rows updated in the last LAG seconds are left for the next refresh, so a
+# transaction that commits a little after its updated_at is not skipped
+LAG = timedelta(seconds=getattr(settings, 'TRANSFER_ROLLUP_LAG', 60))
+# Hours rebuilt per transaction by the backfill
+BATCH_HOURS = getattr(settings, 'TRANSFER_ROLLUP_BATCH_HOURS', 24)
+
+HOUR = timedelta(hours=1)
+DAY = timedelta(days=1)
+
+
+def hour_start(moment):
+    return moment.replace(minute=0, second=0, microsecond=0)
+
+
+def day_start(moment):
+    return moment.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def rebuild_range(start, end) -> int:
+    """
+        Recomputes the hourly rollups of transfers created in [start, end)
+        (hour aligned) and the daily rollups of the days they fall in.
+        Hours include archived transfers (apps.transfers.archive); days are
+        rebuilt from the hourly rows, not from the transfers tables.
+
+        Returns:
+            int: Number of hourly rows written.
+    """
+    totals = {}
+    for model in (Transfer, ArchivedTransfer):
+        rows = (
+            model.objects.filter(created_at__gte=start, created_at__lt=end)
+            .annotate(hour=TruncHour('created_at'))
+            .values('hour', 'currency', 'state')
+            .annotate(total=Count('id'), sending=Sum('sending_amount'), receiving=Sum('receiving_amount'))
+            .order_by()
+        )
+        for row in rows:
+            key = (row['hour'], row['currency'], row['state'])
+            count, sending, receiving = totals.get(key, (0, 0, 0))
+            totals[key] = (count + row['total'], sending + row['sending'], receiving + row['receiving'])
+    hourly = [
+        TransferRollup(
+            period=TransferRollup.Period.HOUR,
+            bucket=hour,
+            currency=currency,
+            state=state,
+            count=count,
+            sending_total=sending,
+            receiving_total=receiving,
+        )
+        for (hour, currency, state), (count, sending, receiving) in totals.items()
+    ]
+
+    first_day, last_day = day_start(start), day_start(end - HOUR) + DAY
+    with transaction.atomic():
+        TransferRollup.objects.filter(period=TransferRollup.Period.HOUR, bucket__gte=start, bucket__lt=end).delete()
+        TransferRollup.objects.bulk_create(hourly, batch_size=1000)
+
+        daily = (
+            TransferRollup.objects.filter(
+                period=TransferRollup.Period.HOUR, bucket__gte=first_day, bucket__lt=last_day,
+            )
+            .annotate(day=TruncDay('bucket'))
+            .values('day', 'currency', 'state')
+            .annotate(total=Sum('count'), sending=Sum('sending_total'), receiving=Sum('receiving_total'))
+            .order_by()
+        )
+        daily = [
+            TransferRollup(
+                period=TransferRollup.Period.DAY,
+                bucket=row['day'],
+                currency=row['currency'],
+                state=row['state'],
+                count=row['total'],
+                sending_total=row['sending'],
+                receiving_total=row['receiving'],
+            )
+            for row in daily
+        ]
+        TransferRollup.objects.filter(
+            period=TransferRollup.Period.DAY, bucket__gte=first_day, bucket__lt=last_day,
+        ).delete()
+        TransferRollup.objects.bulk_create(daily, batch_size=1000)
+    return len(hourly)
+
+
+def hour_runs(hours):
+    """
+        Groups hour starts into contiguous [start, end) ranges.
+    """
+    runs = []
+    for hour in sorted(hours):
+        if runs and runs[-1][1] == hour:
+            runs[-1][1] = hour + HOUR
+        else:
+            runs.append([hour, hour + HOUR])
+    return runs
+
+
+def refresh_rollups() -> dict:
+    """
+        Brings the rollups up to date incrementally.
+
+        Finds the creation hours of transfers updated since the high-water
+        mark (updated_at index), plus the hours of deleted transfers queued
+        in RollupStaleHour, and rebuilds only those hours and their days.
+        The rebuild, the new mark and the removal of the processed queue rows
+        are committed together; the mark row is locked, so overlapping runs
+        (and backfill batches) do not interleave.
+
+        The first run (no mark yet) creates the mark and backfills every
+        existing transfer, so a new deployment needs no manual step; changes
+        made during the backfill are picked up by the next run.
+
+        Returns:
+            dict: Rebuilt hours and the new high-water mark (and the number of
+            backfilled rows on the first run).
+    """
+    upper = timezone.now() - LAG
+    if not RollupWatermark.objects.filter(name=WATERMARK_NAME).exists():
+        _, created = RollupWatermark.objects.get_or_create(name=WATERMARK_NAME, defaults={'value': upper})
+        if created:
+            logger.info("[ROLLUP] No high-water mark yet, backfilling all transfers")
+            rows = backfill_rollups()
+            logger.info(f"[ROLLUP] Backfilled {rows} row(s), up to {upper.isoformat()}")
+            return {"hours": 0, "up_to": upper.isoformat(), "backfilled": rows}
+
+    with transaction.atomic():
+        watermark = RollupWatermark.objects.select_for_update().get(name=WATERMARK_NAME)
+        if watermark.value >= upper:
+            return {"hours": 0, "up_to": watermark.value.isoformat()}
+
+        hours = set(
+            Transfer.objects.filter(updated_at__gt=watermark.value, updated_at__lte=upper)
+            .annotate(hour=TruncHour('created_at'))
+            .values_list('hour', flat=True)
+            .order_by()
+            .distinct()
+        )
+        # Removed by id: hours queued after this read are kept for the next run
+        stale = dict(RollupStaleHour.objects.values_list('id', 'bucket'))
+        hours.update(stale.values())
+        for start, end in hour_runs(hours):
+            rebuild_range(start, end)
+        RollupStaleHour.objects.filter(id__in=stale).delete()
+
+        watermark.value = upper
+        watermark.save(update_fields=['value'])
+
+    logger.info(f"[ROLLUP] Rebuilt {len(hours)} hour(s), up to {upper.isoformat()}")
+    return {"hours": len(hours), "up_to": upper.isoformat()}
+
+
+def backfill_rollups(since=None, until=None, batch_hours=BATCH_HOURS, progress=None) -> int:
+    """
+        Rebuilds the rollups of transfers created in [since, until) in batches
+        of `batch_hours` hours, one transaction per batch.
+
+        The high-water mark is created at the backfill start if there is
+        none yet, so refresh_rollups() picks up everything that changes
+        while the backfill runs. Every batch locks the mark row, like
+        refresh_rollups(), so a refresh and a backfill batch never rebuild
+        the same hours at the same time.
+
+        Args:
+            since (datetime): First hour (defaults to the oldest transfer).
+            until (datetime): End, exclusive (defaults to the end of the current hour).
+            batch_hours (int): Hours per batch.
+            progress (callable): Called with (batch_end, rows) after each batch.
+
+        Returns:
+            int: Number of hourly rows written.
+    """
+    RollupWatermark.objects.get_or_create(name=WATERMARK_NAME, defaults={'value': timezone.now() - LAG})
+    if since is None:
+        since = Transfer.objects.order_by('created_at').values_list('created_at', flat=True).first()
+        if since is None:
+            return 0
+    since = hour_start(since)
+    until = hour_start(until) if until else hour_start(timezone.now()) + HOUR
+
+    written = 0
+    start = since
+    while start < until:
+        end = min(start + batch_hours * HOUR, until)
+        with transaction.atomic():
+            RollupWatermark.objects.select_for_update().filter(name=WATERMARK_NAME).first()
+            rows = rebuild_range(start, end)
+        written += rows
+        if progress:
+            progress(end, rows)
+        start = end
+    return written
+
+
+def read_rollups(period, bucket) -> dict:
+    """
+        Rollup figures of one hour or day.
+
+        Returns:
+            dict: {(state, currency): (count, sending_total, receiving_total)}
+    """
+    return {
+        (row.state, row.currency): (row.count, row.sending_total, row.receiving_total)
+        for row in TransferRollup.objects.filter(period=period, bucket=bucket)
+    }
@@ -0,0 +1,59 @@
+"""
+JSON Schemas for the params of the transfer JSON-RPC methods.
+
+They only describe the shape of the request (required keys and JSON types).
+Business rules (Luhn check, balance, OTP, ...) stay in the Django forms.
+"""
+
+CARD_NUMBER = {"type": "string", "minLength": 1, "maxLength": 19}
+AMOUNT = {"type": ["number", "string"]}
+PHONE = {"type": ["string", "null"], "maxLength": 32}
+TRANSFER_ID = {"type": ["integer", "string"]}
+EXT_ID = {"type": "string", "minLength": 1, "maxLength": 100}
+
+
+CREATE_TRANSFER_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "sender_card_number": CARD_NUMBER,
+        "sender_card_numbere": CARD_NUMBER,  # legacy misspelled key, still accepted
+        "sender_card_expiry": {"type": "string", "minLength": 1, "maxLength": 10},
+        "receiver_card_number": CARD_NUMBER,
+        "sending_amount": AMOUNT,
+        "receiving_amount": AMOUNT,
+        "currency": {"type": ["integer", "string"]},
+        "sender_phone": PHONE,
+        "receiver_phone": PHONE,
+    },
+    "required": ["sender_card_expiry", "receiver_card_number", "sending_amount", "currency"],
+    "anyOf": [
+        {"required": ["sender_card_number"]},
+        {"required": ["sender_card_numbere"]},
+    ],
+}
+
+CONFIRM_TRANSFER_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "transfer_id": TRANSFER_ID,
+        "ext_id": EXT_ID,
+        "otp": {"type": ["string", "integer"], "pattern": "^[0-9]{6}$"},
+    },
+    "required": ["otp"],
+    "anyOf": [
+        {"required": ["transfer_id"]},
+        {"required": ["ext_id"]},
+    ],
+}
+
+CANCEL_TRANSFER_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "transfer_id": TRANSFER_ID,
+        "ext_id": EXT_ID,
+    },
+    "anyOf": [
+        {"required": ["transfer_id"]},
+        {"required": ["ext_id"]},
+    ],
+}
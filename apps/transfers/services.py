@@ -0,0 +1,143 @@
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from apps.cards.cache import bump_card_versions
+from apps.cards.ledger import defers_credits, record_transfer
+from apps.cards.models import Card
+from apps.transfers.models.transfer_models import Transfer
+from apps.utils.stats import record_transfers
+
+# Error codes from the Error table (see populate_errors)
+ERROR_BALANCE_NOT_ENOUGH = 32702
+ERROR_CARD_NOT_ACTIVE = 32705
+ERROR_UNKNOWN = 32706
+
+
+class TransferError(Exception):
+    """
+    Raised when a transfer cannot be completed.
+
+    Attributes:
+        code (int): Error code from the Error table, used for the API response.
+    """
+
+    def __init__(self, code, message=""):
+        super().__init__(message or f"Transfer error {code}")
+        self.code = code
+
+
+def confirm_transfer(transfer: Transfer) -> Transfer:
+    """
+    Confirms a transfer and moves the money between the two cards atomically.
+
+    Everything happens inside one transaction:
+        1. The transfer row is locked and must still be in "created" state,
+           so two concurrent confirmations cannot both succeed.
+        2. Both card rows are locked in a deterministic order (by card number),
+           so transfers A->B and B->A running at the same time cannot deadlock.
+        3. The sender is debited with a conditional F() update
+           (balance >= amount), the receiver is credited with an F() update.
+        4. Both movements are appended to the card ledger (apps.cards.ledger).
+
+    Credits to cards listed in CARD_LEDGER_DEFERRED_CREDIT_CARDS (hot accounts)
+    are only written to the ledger; the receiver row is neither locked nor
+    updated here, apply_pending_credits() folds them into its balance later.
+
+    Args:
+        transfer (Transfer): The transfer to confirm.
+
+    Returns:
+        Transfer: The locked, confirmed transfer instance.
+
+    Raises:
+        TransferError: If the transfer is not confirmable, a card is missing,
+            the sender or receiver card is inactive, or the sender balance is not enough.
+    """
+    with transaction.atomic():
+        transfer = Transfer.objects.select_for_update().get(pk=transfer.pk)
+        if transfer.state != Transfer.State.CREATED:
+            raise TransferError(ERROR_UNKNOWN, "Transfer is not in created state")
+
+        debit = transfer.sending_amount
+        credit = transfer.receiving_amount or transfer.sending_amount
+        defer_credit = defers_credits(transfer.receiver_card_number)
+
+        locked_numbers = {transfer.sender_card_number}
+        if not defer_credit:
+            locked_numbers.add(transfer.receiver_card_number)
+
+        cards = {
+            card.card_number: card
+            for card in Card.objects.select_for_update()
+            .filter(card_number__in=sorted(locked_numbers))
+            .order_by("card_number")
+            .only("id", "card_number", "status", "balance")
+        }
+        if defer_credit:
+            cards.update({
+                card.card_number: card
+                for card in Card.objects.filter(card_number=transfer.receiver_card_number)
+                .only("id", "card_number", "status")
+            })
+        sender = cards.get(transfer.sender_card_number)
+        receiver = cards.get(transfer.receiver_card_number)
+
+        if sender is None or receiver is None:
+            raise TransferError(ERROR_UNKNOWN, "Sender or receiver card not found")
+        if sender.status != Card.Status.ACTIVE:
+            raise TransferError(ERROR_CARD_NOT_ACTIVE, "Sender card is not active")
+        if receiver.status != Card.Status.ACTIVE:
+            raise TransferError(ERROR_CARD_NOT_ACTIVE, "Receiver card is not active")
+
+        now = timezone.now()
+        debited = Card.objects.filter(
+            pk=sender.pk,
+            status=Card.Status.ACTIVE,
+            balance__gte=debit,
+        ).update(balance=F("balance") - debit, updated_at=now)
+        if not debited:
+            raise TransferError(ERROR_BALANCE_NOT_ENOUGH, "Insufficient sender balance")
+
+        if not defer_credit:
+            Card.objects.filter(pk=receiver.pk).update(balance=F("balance") + credit, updated_at=now)
+
+        record_transfer(transfer, sender, receiver, debit, credit, credit_applied=not defer_credit)
+        bump_card_versions(sender.card_number, None if defer_credit else receiver.card_number)
+
+        transfer.state = Transfer.State.CONFIRMED
+        transfer.save(update_fields=["state", "updated_at"])
+
+    return transfer
+
+
+def cancel_transfer(transfer: Transfer) -> Transfer:
+    """
+    Cancels a transfer that is still in "created" state.
+
+    The state is changed with one conditional UPDATE (state = created), so a
+    cancellation can never overwrite a transfer that a concurrent
+    confirm_transfer() has just confirmed. The UPDATE skips post_save, so the
+    state counters (apps.utils.stats) are moved here, in the same transaction.
+
+    Args:
+        transfer (Transfer): The transfer to cancel.
+
+    Returns:
+        Transfer: The transfer, with its new state and cancellation time.
+
+    Raises:
+        TransferError: If the transfer is no longer in "created" state.
+    """
+    with transaction.atomic():
+        now = timezone.now()
+        cancelled = Transfer.objects.filter(pk=transfer.pk, state=Transfer.State.CREATED).update(
+            state=Transfer.State.CANCELLED, cancelled_at=now, updated_at=now,
+        )
+        if not cancelled:
+            raise TransferError(ERROR_UNKNOWN, "Transfer is not in created state")
+        transfer._stats_state = Transfer.State.CREATED
+        transfer.state, transfer.cancelled_at, transfer.updated_at = Transfer.State.CANCELLED, now, now
+        record_transfers([transfer], state=Transfer.State.CANCELLED)
+        transfer._stats_state = Transfer.State.CANCELLED
+    return transfer
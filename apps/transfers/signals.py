@@ -0,0 +1,16 @@
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from apps.transfers.models.rollup_models import RollupStaleHour
+from apps.transfers.models.transfer_models import Transfer
+from apps.transfers.rollups import hour_start
+
+
+@receiver(post_delete, sender=Transfer)
+def transfer_deleted(sender, instance, **kwargs):
+    """
+        Queues the creation hour of a deleted transfer for the next
+        refresh_rollups(), in the transaction of the delete.
+    """
+    if instance.created_at is not None:
+        RollupStaleHour.objects.create(bucket=hour_start(instance.created_at))
@@ -0,0 +1,29 @@
+from celery import shared_task
+
+from .archive import archive_transfers
+from .rollups import refresh_rollups
+
+
+@shared_task
+def refresh_transfer_rollups_task():
+    """
+        Rebuilds the transfer rollups of the hours whose transfers changed
+        since the last run (see apps.transfers.rollups.refresh_rollups).
+
+        Returns:
+            dict: Rebuilt hours and the new high-water mark.
+    """
+    return refresh_rollups()
+
+
+@shared_task
+def archive_transfers_task():
+    """
+        Moves confirmed/cancelled transfers older than
+        TRANSFER_ARCHIVE_AFTER_DAYS days into the archive table
+        (see apps.transfers.archive.archive_transfers).
+
+        Returns:
+            dict: Number of archived transfers.
+    """
+    return {"archived": archive_transfers()}
@@ -1,18 +1,34 @@
 import json
 
-from django.http import JsonResponse
+from django.db import transaction
+from django.http import HttpResponse, JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
 from django.utils import timezone
+from jsonrpcserver import JsonRpcError
+from jsonrpcserver.codes import (
+    ERROR_PARSE_ERROR,
+    ERROR_INVALID_REQUEST,
+    ERROR_METHOD_NOT_FOUND,
+    ERROR_INVALID_PARAMS,
+    ERROR_INTERNAL_ERROR,
+)
+from jsonrpcserver.sentinels import NODATA
 
 from apps.transfers.forms.create_transaction_form import (
     CreateTransferForm,
     ConfirmTransferForm,
     CancelTransferForm,
 )
-from apps.transfers.models.transfer_models import Transfer
-from apps.utils.models.errors_model import Error
-from apps.utils.services import send_telegram_message, generate_otp
+from apps.transfers.registry import rpc_method, get_method
+from apps.transfers.services import cancel_transfer, confirm_transfer, TransferError
+from apps.transfers.schemas import (
+    CREATE_TRANSFER_SCHEMA,
+    CONFIRM_TRANSFER_SCHEMA,
+    CANCEL_TRANSFER_SCHEMA,
+)
+from apps.utils.error_catalog import get_error_message, get_request_language
+from apps.utils.otp import consume_otp, deliver_otp, issue_otp, release_otp_attempt, verify_otp, OTPStatus
 from apps.utils.decorators.logging_decorator import track_method
 
 
@@ -41,27 +57,72 @@ def create_jsonrpc_response(result=None, error=None, request_id=None):
     return response
 
 
-def get_error_message(error_code, lang='en'):
+def process_jsonrpc(body, lang='en'):
     """
-    Retrieves a localized error message by error code.
+    Parses a JSON-RPC request body and dispatches it.
+
+    The body may also be a JSON-RPC 2.0 batch (an array of request objects).
+    Every element goes through the same dispatch inside one shared database
+    transaction and the responses are returned as an array in request order.
+
+    Notifications (request objects without an "id" member) are executed but
+    get no response: they are left out of a batch's array, and there is no
+    response at all for a single notification or a batch of only notifications.
 
     Args:
-        error_code (int): The error code to look up.
-        lang (str): Language for the message ('en', 'ru', 'uz').
+        body (bytes): The raw request body.
+        lang (str): Language of the error messages ('en', 'ru', 'uz').
 
     Returns:
-        str: The localized error message if found, otherwise a default.
+        dict | list | None: A JSON-RPC 2.0 response object (or array of them),
+                            None if nothing is to be returned.
     """
     try:
-        error_obj = Error.objects.get(code=error_code)
-        if lang == 'uz':
-            return error_obj.uz
-        elif lang == 'ru':
-            return error_obj.ru
-        else:
-            return error_obj.en
-    except Error.DoesNotExist:
-        return f"Unknown error: {error_code}"
+        data = json.loads(body)
+    except json.JSONDecodeError:
+        error = {
+            "code": ERROR_PARSE_ERROR,
+            "message": "Parse error",
+            "data": "Invalid JSON"
+        }
+        return create_jsonrpc_response(error=error)
+
+    if isinstance(data, list):
+        if not data:
+            error = {
+                "code": ERROR_INVALID_REQUEST,
+                "message": "Invalid Request",
+                "data": "Empty batch"
+            }
+            return create_jsonrpc_response(error=error)
+
+        responses = []
+        with transaction.atomic():
+            for item in data:
+                response = dispatch_jsonrpc(item, lang=lang)
+                if not is_notification(item):
+                    responses.append(response)
+        return responses or None
+
+    response = dispatch_jsonrpc(data, lang=lang)
+    return None if is_notification(data) else response
+
+
+def is_request_object(data):
+    """
+    Whether data is a valid JSON-RPC 2.0 request object: an object with
+    "jsonrpc": "2.0" and a string "method".
+    """
+    return isinstance(data, dict) and data.get('jsonrpc') == '2.0' and isinstance(data.get('method'), str)
+
+
+def is_notification(data):
+    """
+    Whether a JSON-RPC request object is a notification (has no "id" member;
+    "id": null is a regular request). Invalid request objects are never
+    notifications: they are always answered with an Invalid Request error.
+    """
+    return is_request_object(data) and 'id' not in data
 
 
 @csrf_exempt
@@ -71,66 +132,112 @@ def jsonrpc_handler(request):
     """
     Main JSON-RPC request handler.
 
-    Parses the request body, determines the requested method,
-    and dispatches the call to the appropriate transfer operation
-    (create, confirm, cancel).
+    Parses the request body and dispatches the call to the appropriate
+    transfer operation (create, confirm, cancel), see process_jsonrpc.
+
+    Error messages come from the process-local error catalog
+    (apps.utils.error_catalog), localized from the Accept-Language header.
 
     Args:
         request (HttpRequest): The incoming HTTP request.
 
     Returns:
-        JsonResponse: A JSON-RPC 2.0 formatted response.
+        JsonResponse: A JSON-RPC 2.0 formatted response (or array of responses),
+                      or an empty 204 response if the call was only notifications.
     """
-    try:
-        data = json.loads(request.body)
-        method = data.get('method')
-        params = data.get('params', {})
-        request_id = data.get('id')
-
-        if method in ['create', 'transfer.create']:
-            return create_transfer_jsonrpc(params, request_id)
-        elif method in ['confirm', 'transfer.confirm']:
-            return confirm_transfer_jsonrpc(params, request_id)
-        elif method in ['cancel', 'transfer.cancel']:
-            return cancel_transfer_jsonrpc(params, request_id)
-        else:
-            error = {
-                "code": -32601,
-                "message": "Method not found",
-                "data": f"Unknown method: {method}"
-            }
-            return JsonResponse(create_jsonrpc_response(error=error, request_id=request_id))
+    lang = get_request_language(request)
+    response = process_jsonrpc(request.body, lang=lang)
+    if response is None:
+        return HttpResponse(status=204)
+    return JsonResponse(response, safe=False)
 
-    except json.JSONDecodeError:
+
+def dispatch_jsonrpc(data, lang='en'):
+    """
+    Dispatches a single JSON-RPC request object to its transfer method.
+
+    The method is looked up in the registry (apps.transfers.registry) and its
+    params are checked against the method schema before the handler runs.
+    Handlers may raise jsonrpcserver.JsonRpcError to return a custom error.
+
+    Each call runs in its own (nested) transaction, so a failing element of
+    a batch is rolled back without affecting the others.
+
+    Args:
+        data (dict): A single JSON-RPC request object.
+        lang (str): Language of the error messages ('en', 'ru', 'uz').
+
+    Returns:
+        dict: A JSON-RPC 2.0 response object.
+    """
+    if not is_request_object(data):
         error = {
-            "code": -32700,
-            "message": "Parse error",
-            "data": "Invalid JSON"
+            "code": ERROR_INVALID_REQUEST,
+            "message": "Invalid Request",
+            "data": 'Request must be an object with "jsonrpc": "2.0" and a string "method"'
+        }
+        return create_jsonrpc_response(error=error)
+
+    method = data.get('method')
+    params = data.get('params', {})
+    request_id = data.get('id')
+
+    rpc = get_method(method)
+    if rpc is None:
+        error = {
+            "code": ERROR_METHOD_NOT_FOUND,
+            "message": "Method not found",
+            "data": f"Unknown method: {method}"
         }
-        return JsonResponse(create_jsonrpc_response(error=error))
+        return create_jsonrpc_response(error=error, request_id=request_id)
+
+    violations = rpc.validate(params)
+    if violations:
+        error = {
+            "code": ERROR_INVALID_PARAMS,
+            "message": "Invalid params",
+            "data": violations
+        }
+        return create_jsonrpc_response(error=error, request_id=request_id)
+
+    try:
+        with transaction.atomic():
+            return rpc.func(params, request_id, lang=lang)
+
+    except JsonRpcError as e:
+        error = {"code": e.code, "message": e.message}
+        if e.data is not NODATA:
+            error["data"] = e.data
+        return create_jsonrpc_response(error=error, request_id=request_id)
     except Exception as e:
         error = {
-            "code": -32603,
+            "code": ERROR_INTERNAL_ERROR,
             "message": "Internal error",
             "data": str(e)
         }
-        return JsonResponse(create_jsonrpc_response(error=error, request_id=data.get('id')))
+        return create_jsonrpc_response(error=error, request_id=request_id)
 
 
-def create_transfer_jsonrpc(params, request_id):
+@rpc_method('create', 'transfer.create', schema=CREATE_TRANSFER_SCHEMA)
+def create_transfer_jsonrpc(params, request_id, lang='en'):
     """
     JSON-RPC method: Create a new transfer.
 
     - Validates the input data using CreateTransferForm.
-    - Generates an OTP for confirmation.
     - Saves the transfer in "created" state.
+    - Generates an OTP for confirmation and keeps it in the OTP store
+      (cache, expires after settings.OTP_TTL).
+    - Hands the OTP to the sender's delivery backend after the commit
+      (remote providers via Celery); the response does not wait for the
+      messaging provider.
 
     Args:
         params (dict): Parameters from JSON-RPC request.
         request_id (str | int): Request ID for the response.
+        lang (str): Language of the error messages ('en', 'ru', 'uz').
 
     Returns:
-        JsonResponse: JSON-RPC formatted response with transfer details or errors.
+        dict: JSON-RPC formatted response with transfer details or errors.
     """
     form_data = {
         'sender_card_number': params.get('sender_card_numbere', params.get('sender_card_number', '')).replace(' ', ''),
@@ -151,14 +258,8 @@ def create_transfer_jsonrpc(params, request_id):
 
     if form.is_valid():
         transfer = form.save()
-        code = generate_otp()
-        send_telegram_message(code)
-
-        transfer.otp = code
-        transfer.try_count = 0
-        transfer.save()
-
-        print(f"[v0] Generated OTP for transfer {transfer.id}: {code}")  # Debug log
+        code = issue_otp(transfer.ext_id)
+        deliver_otp(transfer.ext_id, code, transfer.sender_phone)
 
         result = {
             "ext_id": transfer.ext_id,
@@ -168,32 +269,39 @@ def create_transfer_jsonrpc(params, request_id):
             "receiving_amount": str(params.get('receiving_amount', transfer.receiving_amount)),
             "currency": transfer.currency
         }
-        return JsonResponse(create_jsonrpc_response(result=result, request_id=request_id))
+        return create_jsonrpc_response(result=result, request_id=request_id)
     else:
         error_details = {field: [str(error) for error in errors] for field, errors in form.errors.items()}
         error = {
             "code": 1001,
-            "message": get_error_message(1001),
+            "message": get_error_message(1001, lang),
             "data": error_details
         }
-        return JsonResponse(create_jsonrpc_response(error=error, request_id=request_id))
+        return create_jsonrpc_response(error=error, request_id=request_id)
 
 
-def confirm_transfer_jsonrpc(params, request_id):
+@rpc_method('confirm', 'transfer.confirm', schema=CONFIRM_TRANSFER_SCHEMA)
+def confirm_transfer_jsonrpc(params, request_id, lang='en'):
     """
     JSON-RPC method: Confirm a transfer using OTP.
 
     - Validates the input data.
-    - Checks if the OTP matches.
-    - If valid → marks the transfer as "confirmed".
-    - If invalid → increments attempt counter; cancels after 3 failed tries.
+    - Checks the OTP against the cache-backed OTP store (apps.utils.otp).
+    - If valid → moves the funds and marks the transfer as "confirmed"
+      (see apps.transfers.services.confirm_transfer). The code is consumed
+      only when the confirmation commits; if it fails, the attempt is given
+      back and the same code can be used again.
+    - If invalid → the store counts the attempt (no DB write); the transfer
+      is cancelled once the attempts are exhausted.
+    - If the OTP has expired → returns error 32710.
 
     Args:
         params (dict): Parameters from JSON-RPC request.
         request_id (str | int): Request ID for the response.
+        lang (str): Language of the error messages ('en', 'ru', 'uz').
 
     Returns:
-        JsonResponse: JSON-RPC response with confirmation result or error.
+        dict: JSON-RPC response with confirmation result or error.
     """
     form = ConfirmTransferForm(params)
 
@@ -201,83 +309,105 @@ def confirm_transfer_jsonrpc(params, request_id):
         transfer = form.transfer
         otp = form.cleaned_data['otp']
 
-        if transfer.otp == otp:
-            transfer.state = Transfer.State.CONFIRMED
-            transfer.save()
+        otp_status, attempts_left = verify_otp(transfer.ext_id, otp)
+
+        if otp_status == OTPStatus.VALID:
+            try:
+                transfer = confirm_transfer(transfer)
+            except TransferError as e:
+                release_otp_attempt(transfer.ext_id)
+                error = {
+                    "code": e.code,
+                    "message": get_error_message(e.code, lang),
+                    "data": {"ext_id": transfer.ext_id, "detail": str(e)}
+                }
+                return create_jsonrpc_response(error=error, request_id=request_id)
+            consume_otp(transfer.ext_id)
 
             result = {
                 "ext_id": transfer.ext_id,
                 "state": transfer.state,
                 "confirmed_at": timezone.now().isoformat()
             }
-            return JsonResponse(create_jsonrpc_response(result=result, request_id=request_id))
-        else:
-            transfer.try_count += 1
-            transfer.save()
+            return create_jsonrpc_response(result=result, request_id=request_id)
 
-            if transfer.try_count >= 3:
-                transfer.state = Transfer.State.CANCELLED
-                transfer.cancelled_at = timezone.now()
-                transfer.save()
+        if otp_status == OTPStatus.EXHAUSTED:
+            try:
+                cancel_transfer(transfer)
+            except TransferError:
+                pass  # confirmed or cancelled meanwhile: leave it as it is
 
-                error = {
-                    "code": 1003,
-                    "message": get_error_message(1003),
-                    "data": {"ext_id": transfer.ext_id}
-                }
-            else:
-                attempts_left = 3 - transfer.try_count
-                error = {
-                    "code": 1002,
-                    "message": get_error_message(1002),
-                    "data": {"attempts_left": attempts_left}
-                }
+            error = {
+                "code": 1003,
+                "message": get_error_message(1003, lang),
+                "data": {"ext_id": transfer.ext_id}
+            }
+        elif otp_status == OTPStatus.EXPIRED:
+            error = {
+                "code": 32710,
+                "message": get_error_message(32710, lang),
+                "data": {"ext_id": transfer.ext_id}
+            }
+        else:
+            error = {
+                "code": 1002,
+                "message": get_error_message(1002, lang),
+                "data": {"attempts_left": attempts_left}
+            }
 
-            return JsonResponse(create_jsonrpc_response(error=error, request_id=request_id))
+        return create_jsonrpc_response(error=error, request_id=request_id)
     else:
         error_details = {field: [str(error) for error in errors] for field, errors in form.errors.items()}
         error = {
             "code": 1001,
-            "message": get_error_message(1001),
+            "message": get_error_message(1001, lang),
             "data": error_details
         }
-        return JsonResponse(create_jsonrpc_response(error=error, request_id=request_id))
+        return create_jsonrpc_response(error=error, request_id=request_id)
 
 
-def cancel_transfer_jsonrpc(params, request_id):
+@rpc_method('cancel', 'transfer.cancel', schema=CANCEL_TRANSFER_SCHEMA)
+def cancel_transfer_jsonrpc(params, request_id, lang='en'):
     """
     JSON-RPC method: Cancel a transfer.
 
     - Validates the input data.
-    - Sets the transfer state to "cancelled".
-    - Records cancellation timestamp.
+    - Sets the transfer state to "cancelled" and records the cancellation
+      timestamp, only if it is still "created" (see
+      apps.transfers.services.cancel_transfer).
 
     Args:
         params (dict): Parameters from JSON-RPC request.
         request_id (str | int): Request ID for the response.
+        lang (str): Language of the error messages ('en', 'ru', 'uz').
 
     Returns:
-        JsonResponse: JSON-RPC response with cancellation result or errors.
+        dict: JSON-RPC response with cancellation result or errors.
     """
     form = CancelTransferForm(params)
 
     if form.is_valid():
-        transfer = form.transfer
-        transfer.state = Transfer.State.CANCELLED
-        transfer.cancelled_at = timezone.now()
-        transfer.save()
+        try:
+            transfer = cancel_transfer(form.transfer)
+        except TransferError as e:
+            error = {
+                "code": e.code,
+                "message": get_error_message(e.code, lang),
+                "data": {"ext_id": form.transfer.ext_id, "detail": str(e)}
+            }
+            return create_jsonrpc_response(error=error, request_id=request_id)
 
         result = {
             "ext_id": transfer.ext_id,
             "state": transfer.state,
             "cancelled_at": transfer.cancelled_at.isoformat()
         }
-        return JsonResponse(create_jsonrpc_response(result=result, request_id=request_id))
+        return create_jsonrpc_response(result=result, request_id=request_id)
     else:
         error_details = {field: [str(error) for error in errors] for field, errors in form.errors.items()}
         error = {
             "code": 1001,
-            "message": get_error_message(1001),
+            "message": get_error_message(1001, lang),
             "data": error_details
         }
-        return JsonResponse(create_jsonrpc_response(error=error, request_id=request_id))
+        return create_jsonrpc_response(error=error, request_id=request_id)
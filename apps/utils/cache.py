@@ -0,0 +1,88 @@
+import math
+import random
+import time
+import uuid
+
+from django.core.cache import cache, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+
+CACHE_KEY_LOCK = '{key}:lock'
+
+# How long (seconds) a process that lost the recompute race waits for the winner
+LOCK_WAIT = 2.0
+LOCK_POLL_INTERVAL = 0.05
+
+
+def is_shared_cache(alias='default'):
+    """
+        Tells whether a cache is seen by every process (e.g. Redis), rather
+        than kept per process (LocMemCache) or not kept at all (DummyCache).
+    """
+    return not isinstance(caches[alias], (LocMemCache, DummyCache))
+
+
+def cache_entry(value, timeout, delta=0.0):
+    """
+        Wraps a value the way get_or_compute stores it, for callers that
+        write entries themselves (e.g. with cache.set_many).
+    """
+    return value, delta, time.time() + timeout
+
+
+def get_or_compute(key, compute, timeout, lock_timeout=10, beta=1.0):
+    """
+        Read-through cache with stampede protection.
+
+        Values are stored together with the time their computation took and
+        their expiry time. Two mechanisms keep concurrent misses from all
+        hitting the database:
+          - probabilistic early refresh (XFetch): shortly before expiry, a
+            reader occasionally recomputes the value while everyone else is
+            still served the cached one. The probability grows as expiry gets
+            closer and with the cost of the computation (`beta` scales it);
+          - single flight: only the process that wins cache.add() on the lock
+            key recomputes. Others serve the stale value if there is one, or
+            wait up to LOCK_WAIT seconds for the winner's value, then
+            compute it themselves without touching the winner's lock.
+
+        Args:
+            key (str): Cache key.
+            compute (callable): Computes the value (may return None, which is cached too).
+            timeout (int): Time to live of the value, in seconds.
+            lock_timeout (int): Lifetime of the recompute lock, in seconds.
+            beta (float): Early refresh aggressiveness (0 disables it).
+
+        Returns:
+            The cached or freshly computed value.
+    """
+    entry = cache.get(key)
+    if entry is not None:
+        value, delta, expires_at = entry
+        if time.time() - delta * beta * math.log(1.0 - random.random()) < expires_at:
+            return value
+
+    lock_key = CACHE_KEY_LOCK.format(key=key)
+    # Unique per call, so only the holder releases the lock (and not after
+    # it expired and another process took it)
+    token = uuid.uuid4().hex
+    if not cache.add(lock_key, token, timeout=lock_timeout):
+        token = None
+        if entry is not None:
+            return entry[0]
+        deadline = time.monotonic() + LOCK_WAIT
+        while time.monotonic() < deadline:
+            time.sleep(LOCK_POLL_INTERVAL)
+            entry = cache.get(key)
+            if entry is not None:
+                return entry[0]
+
+    try:
+        start = time.time()
+        value = compute()
+        delta = time.time() - start
+        cache.set(key, cache_entry(value, timeout, delta), timeout=timeout)
+        return value
+    finally:
+        if token is not None and cache.get(lock_key) == token:
+            cache.delete(lock_key)
@@ -0,0 +1,28 @@
+from django.conf import settings
+from django.core.checks import Warning, register
+
+from apps.utils.cache import is_shared_cache
+from apps.utils.otp_backends import get_otp_backend
+
+
+@register()
+def check_shared_cache(app_configs, **kwargs):
+    """
+        Warns when OTP codes would be kept in a per-process cache while a
+        queued delivery backend hands them to Celery workers: the worker
+        could not read the code it has to send, and a confirmation served by
+        another process than the create would find no code (OTP expired).
+    """
+    if is_shared_cache():
+        return []
+    paths = [None, *getattr(settings, 'OTP_DELIVERY_ROUTES', {}).values()]
+    if not any(get_otp_backend(path).queued for path in paths):
+        return []
+    return [
+        Warning(
+            "The default cache is a per-process LocMemCache, but OTP codes are "
+            "delivered by Celery workers.",
+            hint="Set REDIS_CACHE_URL to a cache shared by all web and Celery worker processes.",
+            id="utils.W001",
+        )
+    ]
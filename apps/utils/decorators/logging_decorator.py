@@ -18,7 +18,7 @@ def track_method(method_name=None, logger_name='method_tracker'):
         - Response data or error details
 
     Features:
-        - Detects JSON-RPC error responses automatically
+        - Detects JSON-RPC error responses automatically (including batch responses)
         - Differentiates between success, error, and exception logs
 
     Args:
@@ -65,7 +65,9 @@ def track_method(method_name=None, logger_name='method_tracker'):
                 try:
                     if isinstance(result, JsonResponse):
                         resp_json = json.loads(result.content.decode('utf-8'))
-                        if 'error' in resp_json:
+                        if isinstance(resp_json, list):
+                            is_error = any('error' in item for item in resp_json)
+                        elif 'error' in resp_json:
                             is_error = True
                 except Exception:
                     pass
@@ -0,0 +1,108 @@
+import threading
+import time
+import uuid
+from types import MappingProxyType
+
+from django.core.cache import cache
+
+from apps.utils.models.errors_model import Error
+
+CACHE_KEY_ERROR_CATALOG_VERSION = 'error_catalog:version'
+
+# How often (seconds) a process asks the shared cache whether the catalog changed
+VERSION_CHECK_INTERVAL = 5
+
+SUPPORTED_LANGUAGES = ('en', 'ru', 'uz')
+DEFAULT_LANGUAGE = 'en'
+
+_lock = threading.Lock()
+_catalog = None
+_version = None
+_checked_at = 0.0
+
+
+def get_error_catalog():
+    """
+        Returns the process-local error catalog, loading it on first use.
+
+        The catalog is an immutable mapping {code: {'en': ..., 'ru': ..., 'uz': ...}}
+        built with a single query over the Error table. It is reloaded when the
+        shared version key changes (see invalidate_error_catalog); that key is
+        checked at most every VERSION_CHECK_INTERVAL seconds.
+    """
+    global _catalog, _version, _checked_at
+
+    now = time.monotonic()
+    if _catalog is not None and now - _checked_at < VERSION_CHECK_INTERVAL:
+        return _catalog
+
+    with _lock:
+        version = cache.get(CACHE_KEY_ERROR_CATALOG_VERSION)
+        if _catalog is None or version != _version:
+            _catalog = MappingProxyType({
+                code: MappingProxyType({'en': en, 'ru': ru, 'uz': uz})
+                for code, en, ru, uz in Error.objects.values_list('code', 'en', 'ru', 'uz')
+            })
+            _version = version
+        _checked_at = now
+        return _catalog
+
+
+def invalidate_error_catalog():
+    """
+        Drops the local catalog and bumps the shared version key,
+        so every process reloads the catalog on its next version check.
+    """
+    global _catalog
+
+    with _lock:
+        _catalog = None
+    cache.set(CACHE_KEY_ERROR_CATALOG_VERSION, uuid.uuid4().hex, timeout=None)
+
+
+def get_error_message(error_code, lang=DEFAULT_LANGUAGE, default=None):
+    """
+    Retrieves a localized error message by error code from the cached catalog.
+
+    Args:
+        error_code (int): The error code to look up.
+        lang (str): Language for the message ('en', 'ru', 'uz').
+        default (str | None): Message for unknown codes.
+            Defaults to "Unknown error: <code>".
+
+    Returns:
+        str: The localized error message if found, otherwise the default.
+    """
+    messages = get_error_catalog().get(error_code)
+    if messages is None:
+        return default if default is not None else f"Unknown error: {error_code}"
+    return messages.get(lang) or messages[DEFAULT_LANGUAGE]
+
+
+def get_request_language(request):
+    """
+    Negotiates the error message language from the Accept-Language header.
+
+    Example:
+        "uz-UZ,uz;q=0.9,ru;q=0.8" -> 'uz'
+
+    Args:
+        request (HttpRequest): The incoming request.
+
+    Returns:
+        str: One of SUPPORTED_LANGUAGES, DEFAULT_LANGUAGE if none matches.
+    """
+    header = request.META.get('HTTP_ACCEPT_LANGUAGE', '')
+    choices = []
+    for index, part in enumerate(header.split(',')):
+        lang, _, params = part.strip().partition(';')
+        quality = 1.0
+        if params.strip().startswith('q='):
+            try:
+                quality = float(params.strip()[2:])
+            except ValueError:
+                continue
+        code = lang.split('-')[0].lower()
+        if code in SUPPORTED_LANGUAGES and quality > 0:
+            choices.append((-quality, index, code))
+    return min(choices)[2] if choices else DEFAULT_LANGUAGE
@@ -0,0 +1,45 @@
+from collections import Counter
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count
+
+from apps.cards.models import Card
+from apps.transfers.models.archive_models import ArchivedTransfer
+from apps.transfers.models.transfer_models import Transfer
+from apps.utils.models.stat_counter_model import StatCounter
+from apps.utils.stats import STAT_CARDS, STAT_TRANSFER_STATE, STAT_TRANSFERS
+
+
+class Command(BaseCommand):
+    """
+        Recomputes the system statistics counters (apps.utils.stats) from the
+        cards and transfers tables (archived transfers included).
+
+        Needed once after deploying the counters, or after rows were written
+        behind the ORM's back. Scans both tables, so run it off-peak; writes
+        committed while it runs may be counted twice or not at all.
+
+        Example usage:
+          python manage.py rebuild_stats
+    """
+
+    help = "Recompute the system statistics counters from the cards and transfers tables"
+
+    def handle(self, *args, **options):
+        states = Counter()
+        for model in (Transfer, ArchivedTransfer):
+            states.update(dict(model.objects.values_list("state").annotate(total=Count("id")).order_by()))
+        counters = [
+            StatCounter(name=STAT_CARDS, value=Card.objects.count()),
+            StatCounter(name=STAT_TRANSFERS, value=sum(states.values())),
+        ] + [
+            StatCounter(name=STAT_TRANSFER_STATE.format(state=state), value=states.get(state, 0))
+            for state in Transfer.State.values
+        ]
+
+        with transaction.atomic():
+            StatCounter.objects.all().delete()
+            StatCounter.objects.bulk_create(counters)
+
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {len(counters)} counters"))
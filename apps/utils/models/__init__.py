@@ -1 +1,2 @@
-from .errors_model import Error
\ No newline at end of file
+from .errors_model import Error
+from .stat_counter_model import StatCounter
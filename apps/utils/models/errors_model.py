@@ -1,6 +1,7 @@
 from django.db import models
 from django.utils.translation import gettext_lazy as _
-from jsonrpcserver import Error as JsonRpcError
+from jsonrpcserver import Error as JsonRpcError, JsonRpcError as JsonRpcException
+from jsonrpcserver.sentinels import NODATA
 
 from apps.utils.models.base_model import BaseModel
 
@@ -44,8 +45,8 @@ class Error(BaseModel):
 
 class CustomError:
     """
-    Custom error wrapper that loads messages from the Error model
-    and formats them for API or JSON-RPC responses.
+    Custom error wrapper that loads messages from the cached error catalog
+    (apps.utils.error_catalog) and formats them for API or JSON-RPC responses.
     """
 
     def __init__(self, code, lang='en'):
@@ -53,24 +54,14 @@ class CustomError:
         Initialize a custom error.
 
         Args:
-            code (int): Error code to look up in the database.
+            code (int): Error code to look up in the error catalog.
             lang (str): Language code ('en', 'ru', 'uz'). Defaults to 'en'.
         """
+        from apps.utils.error_catalog import get_error_message
+
         self.code = code
         self.lang = lang
-
-        try:
-            error = Error.objects.get(code=code)
-
-            if lang == 'uz':
-                self.message = error.uz
-            elif lang == 'ru':
-                self.message = error.ru
-            else:
-                self.message = error.en
-
-        except Error.DoesNotExist:
-            self.message = "Unknown error"
+        self.message = get_error_message(code, lang, default="Unknown error")
 
     def as_dict(self):
         """
@@ -95,3 +86,16 @@ class CustomError:
             JsonRpcError: Compatible JSON-RPC error.
         """
         return JsonRpcError(code=self.code, message=self.message)
+
+    def to_jsonrpc_exception(self, data=NODATA):
+        """
+        Convert the error into an exception that can be raised from a
+        registered JSON-RPC method (see apps.transfers.registry).
+
+        Args:
+            data: Optional extra data for the JSON-RPC error object.
+
+        Returns:
+            JsonRpcException: Exception carrying the code and localized message.
+        """
+        return JsonRpcException(code=self.code, message=self.message, data=data)
@@ -0,0 +1,36 @@
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+
+class StatCounter(models.Model):
+    """
+        A system statistic kept up to date incrementally (see apps.utils.stats).
+
+        A counter is split over several shard rows, so concurrent transactions
+        incrementing the same counter rarely wait for each other's row lock;
+        its value is the sum over the shards.
+    """
+
+    name = models.CharField(
+        max_length=100,
+        verbose_name=_("Name"),
+    )
+    shard = models.PositiveSmallIntegerField(
+        default=0,
+        verbose_name=_("Shard"),
+    )
+    value = models.BigIntegerField(
+        default=0,
+        verbose_name=_("Value"),
+    )
+
+    class Meta:
+        db_table = "stat_counters"
+        constraints = [
+            models.UniqueConstraint(fields=["name", "shard"], name="stat_counter_name_shard_uniq"),
+        ]
+        verbose_name = _("Statistic counter")
+        verbose_name_plural = _("Statistic counters")
+
+    def __str__(self):
+        return f"{self.name}[{self.shard}] = {self.value}"
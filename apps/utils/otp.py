@@ -0,0 +1,130 @@
+import time
+from enum import Enum
+
+from functools import partial
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from apps.utils.otp_backends import route_otp
+from apps.utils.services import generate_otp
+
+CACHE_KEY_OTP_CODE = 'otp:{ext_id}:code'
+CACHE_KEY_OTP_TRIES = 'otp:{ext_id}:tries'
+
+
+class OTPStatus(Enum):
+    """
+        Outcome of an OTP check.
+    """
+    VALID = 'valid'
+    INVALID = 'invalid'
+    EXPIRED = 'expired'
+    EXHAUSTED = 'exhausted'
+
+
+def _keys(ext_id):
+    return CACHE_KEY_OTP_CODE.format(ext_id=ext_id), CACHE_KEY_OTP_TRIES.format(ext_id=ext_id)
+
+
+def issue_otp(ext_id) -> str:
+    """
+        Generates a new OTP for a transfer and stores it with a zeroed attempt
+        counter. Both keys expire after settings.OTP_TTL seconds, so expired
+        codes disappear without any cleanup job.
+
+        Returns:
+            str: The generated OTP code.
+    """
+    code = generate_otp()
+    code_key, tries_key = _keys(ext_id)
+    cache.set_many({code_key: code, tries_key: 0}, timeout=settings.OTP_TTL)
+    return code
+
+
+def verify_otp(ext_id, otp) -> tuple[OTPStatus, int]:
+    """
+        Checks an OTP attempt for a transfer without touching the database.
+
+        Every attempt first bumps the attempt counter with an atomic cache incr,
+        so concurrent guesses cannot exceed settings.OTP_MAX_ATTEMPTS.
+        The code is removed once the attempts are exhausted; a valid code
+        stays until the caller consumes it (consume_otp) or gives the
+        attempt back (release_otp_attempt), so a confirmation that fails
+        after the check can be retried with the same code.
+
+        Returns:
+            tuple[OTPStatus, int]: The outcome and the number of attempts left.
+    """
+    max_attempts = settings.OTP_MAX_ATTEMPTS
+    code_key, tries_key = _keys(ext_id)
+
+    try:
+        tries = cache.incr(tries_key)
+    except ValueError:
+        return OTPStatus.EXPIRED, 0
+
+    if tries > max_attempts:
+        return OTPStatus.EXHAUSTED, 0
+
+    code = cache.get(code_key)
+    if code is None:
+        return OTPStatus.EXPIRED, 0
+
+    if str(code) == str(otp):
+        return OTPStatus.VALID, max_attempts - tries
+
+    if tries >= max_attempts:
+        cache.delete_many([code_key, tries_key])
+        return OTPStatus.EXHAUSTED, 0
+
+    return OTPStatus.INVALID, max_attempts - tries
+
+
+def get_otp_code(ext_id) -> str | None:
+    """
+        Returns the current OTP code of a transfer, or None once it expired,
+        was used or its attempts were exhausted.
+    """
+    return cache.get(_keys(ext_id)[0])
+
+
+def consume_otp(ext_id) -> None:
+    """
+        Removes a transfer's OTP once the current transaction commits, so a
+        confirmation that is rolled back leaves the code usable.
+    """
+    transaction.on_commit(partial(cache.delete_many, list(_keys(ext_id))))
+
+
+def release_otp_attempt(ext_id) -> None:
+    """
+        Gives back the attempt of a valid code whose confirmation failed
+        (e.g. insufficient balance), so retries do not exhaust the OTP.
+    """
+    try:
+        cache.decr(_keys(ext_id)[1])
+    except ValueError:
+        pass
+
+
+def deliver_otp(ext_id, code, phone=None) -> None:
+    """
+        Hands a just issued OTP code over to the recipient's delivery backend
+        (apps.utils.otp_backends.route_otp) once the current transaction
+        commits, so no code is sent for a rolled back transfer.
+
+        Backends that call a remote provider go through the Celery delivery
+        task (apps.utils.tasks.send_otp_task), so the request never waits for
+        the provider. The task only gets the transfer's ext_id and the issue
+        time: the code stays in the OTP store and the phone in the database,
+        not in the broker. Local backends (console, in-memory) are called directly.
+    """
+    from apps.utils.tasks import send_otp_task
+
+    backend = route_otp(phone)
+    if backend.queued:
+        transaction.on_commit(partial(send_otp_task.delay, ext_id, time.time()), robust=True)
+    else:
+        transaction.on_commit(partial(backend.send, phone, code), robust=True)
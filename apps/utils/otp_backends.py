@@ -0,0 +1,193 @@
+import logging
+import os
+import sys
+import threading
+from abc import ABC, abstractmethod
+from collections import deque
+from dataclasses import dataclass
+from functools import lru_cache
+
+import requests
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.module_loading import import_string
+from requests.adapters import HTTPAdapter
+
+from apps.utils.telegram import get_telegram_client
+
+logger = logging.getLogger(__name__)
+
+CACHE_KEY_OUTBOX_COUNT = 'otp_outbox:count'
+# Messages kept by LocMemBackend; older ones are dropped
+OUTBOX_SIZE = getattr(settings, 'OTP_OUTBOX_SIZE', 1000)
+
+DEFAULT_BACKEND = 'apps.utils.otp_backends.TelegramBackend'
+MESSAGE_TEMPLATE = getattr(settings, 'OTP_MESSAGE_TEMPLATE', 'Your confirmation code: {code}')
+
+
+@dataclass(frozen=True)
+class OTPMessage:
+    """
+        One OTP code addressed to a phone number.
+    """
+    phone: str
+    code: str
+
+    @property
+    def text(self) -> str:
+        return MESSAGE_TEMPLATE.format(code=self.code)
+
+
+class BaseOTPBackend(ABC):
+    """
+        Base class of the OTP delivery backends (see settings.OTP_DELIVERY_BACKEND).
+
+        Subclasses implement send_messages(). Backends with `queued = True`
+        talk to a remote provider and are called from the Celery delivery task;
+        the others are called right after the transfer is committed.
+    """
+    queued = True
+
+    @abstractmethod
+    def send_messages(self, messages: list[OTPMessage]) -> list[OTPMessage]:
+        """
+            Sends a batch of messages.
+
+            Returns:
+                list[OTPMessage]: The messages that could not be sent.
+        """
+
+    def send(self, phone: str, code: str) -> bool:
+        return not self.send_messages([OTPMessage(phone, code)])
+
+
+class TelegramBackend(BaseOTPBackend):
+    """
+        Sends every code to the configured Telegram chat (the bot cannot
+        address a phone number, so the chat shows which phone a code is for).
+    """
+
+    def __init__(self):
+        self.chat_id = getattr(settings, 'OTP_TELEGRAM_CHAT_ID', os.getenv('chat_id'))
+
+    def send_messages(self, messages):
+        client = get_telegram_client()
+        return [
+            message for message in messages
+            if not client.send_message(self.chat_id, f"{message.phone or ''}: {message.text}")
+        ]
+
+
+class SMSBackend(BaseOTPBackend):
+    """
+        Sends codes through an HTTP SMS gateway, one request per batch:
+
+            POST settings.SMS_GATEWAY_URL
+            {"messages": [{"to": "+998...", "text": "..."}, ...]}
+    """
+
+    def __init__(self):
+        self.url = settings.SMS_GATEWAY_URL
+        self.timeout = getattr(settings, 'SMS_GATEWAY_TIMEOUT', (3.05, 10))
+        self.session = requests.Session()
+        self.session.mount('https://', HTTPAdapter(pool_maxsize=10))
+        self.session.mount('http://', HTTPAdapter(pool_maxsize=10))
+        token = getattr(settings, 'SMS_GATEWAY_TOKEN', None)
+        if token:
+            self.session.headers['Authorization'] = f"Bearer {token}"
+
+    def send_messages(self, messages):
+        if not messages:
+            return []
+        payload = {"messages": [{"to": message.phone, "text": message.text} for message in messages]}
+        try:
+            response = self.session.post(self.url, json=payload, timeout=self.timeout)
+            response.raise_for_status()
+        except requests.RequestException as e:
+            logger.error(f"[SMS] Failed to send {len(messages)} message(s): {e}")
+            return list(messages)
+        return []
+
+
+class ConsoleBackend(BaseOTPBackend):
+    """
+        Writes codes to stdout (development).
+    """
+    queued = False
+
+    def __init__(self, stream=None):
+        self.stream = stream or sys.stdout
+        self._lock = threading.Lock()
+
+    def send_messages(self, messages):
+        with self._lock:
+            for message in messages:
+                self.stream.write(f"[OTP] {message.phone}: {message.text}\n")
+            self.stream.flush()
+        return []
+
+
+outbox = deque(maxlen=OUTBOX_SIZE)
+
+
+class LocMemBackend(BaseOTPBackend):
+    """
+        Keeps codes in memory instead of sending them (tests, load tests).
+
+        Messages are appended to apps.utils.otp_backends.outbox (the last
+        OUTBOX_SIZE are kept, so a long load test does not grow it), and a counter
+        is kept in the shared cache so a load test running in another process
+        can check that every code was handed off (see outbox_count()).
+    """
+    queued = False
+
+    def send_messages(self, messages):
+        outbox.extend(messages)
+        cache.add(CACHE_KEY_OUTBOX_COUNT, 0, timeout=None)
+        cache.incr(CACHE_KEY_OUTBOX_COUNT, len(messages))
+        return []
+
+
+def outbox_count() -> int:
+    """
+        Number of messages handed to LocMemBackend by all processes sharing the cache.
+    """
+    return cache.get(CACHE_KEY_OUTBOX_COUNT, 0)
+
+
+@lru_cache(maxsize=None)
+def get_otp_backend(path: str = None) -> BaseOTPBackend:
+    """
+        Returns the (process-wide) backend instance for a dotted path,
+        settings.OTP_DELIVERY_BACKEND by default.
+    """
+    return import_string(path or getattr(settings, 'OTP_DELIVERY_BACKEND', DEFAULT_BACKEND))()
+
+
+def route_otp(phone: str) -> BaseOTPBackend:
+    """
+        Picks the backend of a recipient: the longest matching phone prefix
+        in settings.OTP_DELIVERY_ROUTES, otherwise the default backend.
+    """
+    routes = getattr(settings, 'OTP_DELIVERY_ROUTES', {})
+    prefixes = [prefix for prefix in routes if phone and phone.startswith(prefix)]
+    if prefixes:
+        return get_otp_backend(routes[max(prefixes, key=len)])
+    return get_otp_backend()
+
+
+def send_otp_messages(messages: list[OTPMessage]) -> list[OTPMessage]:
+    """
+        Sends messages in one batch per backend.
+
+        Returns:
+            list[OTPMessage]: The messages that could not be sent.
+    """
+    batches = {}
+    for message in messages:
+        batches.setdefault(route_otp(message.phone), []).append(message)
+
+    failed = []
+    for backend, batch in batches.items():
+        failed.extend(backend.send_messages(batch))
+    return failed
@@ -1,11 +1,3 @@
-import os
-from dotenv import load_dotenv
-
-load_dotenv()
-TELEGRAM_BOT_TOKEN = os.getenv('TELEGRAM_BOT_TOKEN')
-user_chat_id = os.getenv('chat_id')
-
-import requests
 import logging
 import random
 from decimal import Decimal
@@ -28,33 +20,6 @@ def generate_otp(length: int = 6) -> str:
     return "".join(str(random.randint(0, 9)) for _ in range(length))
 
 
-def send_telegram_message(message: str) -> bool:
-    """
-        Send a message to a Telegram chat using the Bot API.
-
-        Requires:
-        - TELEGRAM_BOT_TOKEN (from .env)
-        - chat_id (from .env)
-    """
-    token = TELEGRAM_BOT_TOKEN
-    chat_id = user_chat_id
-    url = f"https://api.telegram.org/bot{token}/sendMessage"
-
-    payload = {
-        "chat_id": chat_id,
-        "text": message,
-    }
-
-    try:
-        response = requests.post(url, data=payload, timeout=10)
-        response.raise_for_status()
-        logger.info(f"[TELEGRAM] Message sent: {message}")
-        return True
-    except requests.RequestException as e:
-        logger.error(f"[TELEGRAM] Failed to send message: {e}")
-        return False
-
-
 def calculate_exchange(amount: Decimal, currency: int) -> Decimal:
     """
         Convert an amount to the target currency using static exchange rates.
@@ -141,3 +106,38 @@ def mask_expire(expire: str) -> str:
         return f"{month}/--"
 
     return expire
+
+
+def parse_expire(expire: str, year_only: bool = True) -> tuple[int, int] | None:
+    """
+        Parse a card expiry date in any supported format into (month, year).
+        Uses the same rules as mask_expire.
+
+        Examples:
+        - 12/24   -> (12, 2024)
+        - 2024-12 -> (12, 2024)
+        - 12.2024 -> (12, 2024)
+        - 2024    -> (1, 2024), or None if year_only is False
+        - 12 or invalid month -> None
+
+        Card authentication passes year_only=False: a bare year names no
+        month, so it must not match a card expiring in January.
+    """
+    digits = "".join(ch for ch in str(expire or "") if ch.isdigit())
+
+    if len(digits) == 6 and digits.startswith("20"):
+        year, month = int(digits[:4]), int(digits[4:])
+    elif len(digits) == 6:
+        month, year = int(digits[:2]), int(digits[2:])
+    elif len(digits) == 4 and digits.startswith("20"):
+        if not year_only:
+            return None
+        month, year = 1, int(digits)
+    elif len(digits) == 4:
+        month, year = int(digits[:2]), 2000 + int(digits[2:])
+    else:
+        return None
+
+    if not 1 <= month <= 12:
+        return None
+    return month, year
@@ -0,0 +1,65 @@
+from django.db import transaction
+from django.db.models.signals import post_init, post_save, post_delete
+from django.dispatch import receiver
+
+from apps.cards.models import Card
+from apps.transfers.models.transfer_models import Transfer
+from apps.utils.error_catalog import invalidate_error_catalog
+from apps.utils.models.errors_model import Error
+from apps.utils.stats import record_cards, record_transfer_deleted, record_transfers
+
+
+@receiver(post_save, sender=Error)
+@receiver(post_delete, sender=Error)
+def error_changed(sender, **kwargs):
+    """
+        Invalidates the cached error catalog whenever an Error row changes,
+        once the change is committed (a reload before the commit would
+        cache the old rows again).
+    """
+    transaction.on_commit(invalidate_error_catalog)
+
+
+@receiver(post_save, sender=Card)
+def card_counted(sender, instance, created, **kwargs):
+    """
+        Counts new cards in the system statistics.
+    """
+    if created:
+        record_cards(1)
+
+
+@receiver(post_delete, sender=Card)
+def card_uncounted(sender, instance, **kwargs):
+    record_cards(-1)
+
+
+@receiver(post_init, sender=Transfer)
+def transfer_loaded(sender, instance, **kwargs):
+    """
+        Remembers the state a transfer had when it was loaded, so a save can
+        tell which state counter to move it from. A deferred state is not
+        loaded (None): such saves do not change the state.
+    """
+    instance._stats_state = instance.__dict__.get('state')
+
+
+@receiver(post_save, sender=Transfer)
+def transfer_counted(sender, instance, created, update_fields=None, **kwargs):
+    """
+        Updates the transfer statistics in the transaction of the save.
+    """
+    if created:
+        record_transfers([instance])
+    elif (
+        instance._stats_state is not None
+        and instance._stats_state != instance.state
+        and (update_fields is None or 'state' in update_fields)
+    ):
+        record_transfers([instance], state=instance.state)
+    instance._stats_state = instance.state
+
+
+@receiver(post_delete, sender=Transfer)
+def transfer_uncounted(sender, instance, **kwargs):
+    record_transfer_deleted(instance)
@@ -0,0 +1,109 @@
+import random
+from collections import Counter
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F, Sum
+
+from apps.cards.models import Card
+from apps.utils.models.stat_counter_model import StatCounter
+
+STAT_CARDS = 'cards'
+STAT_TRANSFERS = 'transfers'
+STAT_TRANSFER_STATE = 'transfers:state:{state}'
+
+# Rows per counter; more shards mean less lock contention and slightly larger reads
+SHARDS = getattr(settings, 'STAT_COUNTER_SHARDS', 8)
+
+
+def increment(changes: dict) -> None:
+    """
+        Adds to several counters in the caller's transaction.
+
+        Args:
+            changes (dict): {name: delta}.
+    """
+    with transaction.atomic():
+        for name, delta in changes.items():
+            shard = random.randrange(SHARDS)
+            counters = StatCounter.objects.filter(name=name, shard=shard)
+            if counters.update(value=F('value') + delta):
+                continue
+            try:
+                with transaction.atomic():
+                    StatCounter.objects.create(name=name, shard=shard, value=delta)
+            except IntegrityError:
+                # Another transaction created the shard row first
+                counters.update(value=F('value') + delta)
+
+
+def read_counters(names) -> dict:
+    """
+        Reads several counters with one query (bounded by names x shards rows,
+        independent of the size of the counted tables).
+
+        Returns:
+            dict: {name: value}, 0 for counters that do not exist yet.
+    """
+    result = dict.fromkeys(names, 0)
+    rows = StatCounter.objects.filter(name__in=result).values('name').annotate(total=Sum('value'))
+    for row in rows:
+        result[row['name']] = row['total']
+    return result
+
+
+def record_cards(delta: int) -> None:
+    """
+        Adds created (positive delta) or deleted (negative delta) cards to the
+        card counter. Called by the Card signals, and directly for bulk inserts.
+    """
+    if delta:
+        increment({STAT_CARDS: delta})
+
+
+def recount_cards() -> int:
+    """
+        Resets the card counter to the number of rows in the cards table.
+
+        Used after bulk upserts (the Excel import), which cannot tell cheaply
+        and race-free how many of their rows were inserts. The counter rows
+        are locked first, so increments of cards saved meanwhile wait for the
+        reset instead of being overwritten.
+
+        Returns:
+            int: The new card count.
+    """
+    with transaction.atomic():
+        list(StatCounter.objects.select_for_update().filter(name=STAT_CARDS).values_list('id', flat=True))
+        total = Card.objects.count()
+        StatCounter.objects.filter(name=STAT_CARDS).delete()
+        StatCounter.objects.create(name=STAT_CARDS, shard=0, value=total)
+    return total
+
+
+def record_transfers(transfers, state=None) -> None:
+    """
+        Counts transfers that were created, or moved to `state`.
+        Called by the Transfer signals, and directly for bulk inserts.
+    """
+    changes = Counter()
+    for transfer in transfers:
+        if state is None:
+            changes[STAT_TRANSFERS] += 1
+        else:
+            changes[STAT_TRANSFER_STATE.format(state=transfer._stats_state)] -= 1
+        changes[STAT_TRANSFER_STATE.format(state=state or transfer.state)] += 1
+
+    if changes:
+        increment(changes)
+
+
+def record_transfer_deleted(transfer) -> None:
+    """
+        Removes a deleted transfer from the total and state counters.
+    """
+    state = getattr(transfer, '_stats_state', None) or transfer.state
+    increment({
+        STAT_TRANSFERS: -1,
+        STAT_TRANSFER_STATE.format(state=state): -1,
+    })
@@ -1,14 +1,23 @@
+import logging
 import os
-import requests
+import random
+import time
 from dotenv import load_dotenv
 from celery import shared_task
-from apps.cards.models.card import Card
-from apps.transfers.models.transfer_models import Transfer
+from django.conf import settings
+from django.utils import timezone
+from apps.transfers.models import Transfer, TransferRollup
+from apps.transfers.rollups import day_start, hour_start, read_rollups
+from apps.utils.otp import get_otp_code
+from apps.utils.otp_backends import OTPMessage, send_otp_messages
+from apps.utils.stats import STAT_CARDS, STAT_TRANSFER_STATE, STAT_TRANSFERS, read_counters
+from apps.utils.telegram import get_telegram_client
 
 load_dotenv()
-TELEGRAM_BOT_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN")
 CHAT_ID = os.getenv("chat_id")
 
+logger = logging.getLogger(__name__)
+
 
 @shared_task
 def telegram_report():
@@ -18,28 +27,79 @@ def telegram_report():
 
     The report includes:
     - Total number of cards in the system
-    - Total number of transfers in the system
+    - Total number of transfers in the system, per state
+    - Transfers created this hour and today, per state and currency,
+      with their count and sending amount
+
+    Totals come from the incrementally maintained counters
+    (apps.utils.stats), the hour/day figures from the transfer rollups
+    (apps.transfers.rollups); the cards and transfers tables are not read.
     """
+    states = Transfer.State.values
+    counters = read_counters(
+        [STAT_CARDS, STAT_TRANSFERS] + [STAT_TRANSFER_STATE.format(state=state) for state in states]
+    )
+    now = timezone.now()
+    hour = read_rollups(TransferRollup.Period.HOUR, hour_start(now))
+    day = read_rollups(TransferRollup.Period.DAY, day_start(now))
 
-    url = f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}/sendMessage"
+    lines = [
+        "This is the total system report:",
+        f" - Total Cards: {counters[STAT_CARDS]}",
+        f" - Total Transfers: {counters[STAT_TRANSFERS]}",
+    ]
+    lines += [f"   - {state}: {counters[STAT_TRANSFER_STATE.format(state=state)]}" for state in states]
+    for title, rollups in (("This hour", hour), ("Today", day)):
+        lines.append(f"{title}:")
+        lines += [
+            f" - {state} {currency}: {count} transfers, {sending}"
+            for (state, currency), (count, sending, _) in sorted(rollups.items())
+        ] or [" - no transfers"]
+    text = "\n".join(lines)
 
-    total_card_count = Card.objects.count()
-    total_transfer_count = Transfer.objects.count()
+    if get_telegram_client().send_message(CHAT_ID, text):
+        return "Report successfully sent"
+    return "Failed to send report"
 
-    text = (
-        f"This is the total system report:\n"
-        f" - Total Cards: {total_card_count}\n"
-        f" - Total Transfers: {total_transfer_count}"
-    )
 
-    payload = {
-        "chat_id": CHAT_ID,
-        "text": text,
-    }
-
-    try:
-        response = requests.post(url, data=payload, timeout=10)
-        response.raise_for_status()
-        return f"Report successfully sent: {response.text}"
-    except requests.RequestException as e:
-        return f"Failed to send report: {e}, response={getattr(e, 'response', None)}"
+@shared_task(bind=True, max_retries=getattr(settings, "OTP_DELIVERY_MAX_RETRIES", 5), ignore_result=True)
+def send_otp_task(self, ext_id, issued_at):
+    """
+    Celery task that delivers the OTP code of a transfer to its sender
+    through the backend routed for their phone number (apps.utils.otp_backends).
+
+    The code is read from the OTP store and the phone from the transfer, so
+    neither travels through the broker. The OTP store must be the shared
+    cache (settings.REDIS_CACHE_URL): a code missing before its expiry is
+    logged as an error, since it usually means the worker has its own cache.
+
+    Failed deliveries are retried with exponential backoff and jitter
+    (1s, 2s, 4s, ... capped at 60s), as long as the retry runs before the
+    code expires (settings.OTP_TTL seconds after `issued_at`).
+
+    Parameters:
+        ext_id (str): External id of the transfer.
+        issued_at (float): Unix time when the code was issued.
+    """
+    phone = Transfer.objects.filter(ext_id=ext_id).values_list("sender_phone", flat=True).first()
+    if phone is None:
+        logger.error(f"[OTP] Transfer {ext_id} not found, code not sent")
+        return
+    code = get_otp_code(ext_id)
+    if code is None:
+        if time.time() < issued_at + settings.OTP_TTL:
+            logger.error(
+                f"[OTP] Code of transfer {ext_id} not found in the OTP store before its expiry "
+                f"(used or exhausted already, or the cache is not shared with this worker), code not sent"
+            )
+        else:
+            logger.warning(f"[OTP] Code of transfer {ext_id} expired before delivery, code not sent")
+        return
+
+    if not send_otp_messages([OTPMessage(phone, code)]):
+        return
+
+    countdown = min(2 ** self.request.retries, 60) + random.random()
+    if self.request.retries >= self.max_retries or time.time() + countdown >= issued_at + settings.OTP_TTL:
+        return
+    raise self.retry(countdown=countdown)
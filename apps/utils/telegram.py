@@ -0,0 +1,256 @@
+import logging
+import threading
+import time
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+# Telegram Bot API limits: about 1 message per second to the same chat,
+# about 30 messages per second overall.
+CHAT_RATE = getattr(settings, 'TELEGRAM_CHAT_RATE', 1.0)
+CHAT_BURST = getattr(settings, 'TELEGRAM_CHAT_BURST', 3)
+GLOBAL_RATE = getattr(settings, 'TELEGRAM_GLOBAL_RATE', 30.0)
+# Longest time a send waits for the rate limiter before giving up
+MAX_WAIT = getattr(settings, 'TELEGRAM_MAX_WAIT', 2.0)
+
+# Consecutive failures that open the circuit, and how long it stays open
+BREAKER_THRESHOLD = getattr(settings, 'TELEGRAM_BREAKER_THRESHOLD', 5)
+BREAKER_RESET_TIMEOUT = getattr(settings, 'TELEGRAM_BREAKER_RESET_TIMEOUT', 30.0)
+
+# (connect, read) timeouts in seconds
+TIMEOUT = getattr(settings, 'TELEGRAM_TIMEOUT', (3.05, 10))
+
+
+class TokenBucket:
+    """
+        Thread-safe token bucket: `rate` tokens per second, at most `capacity` stored.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """
+            Takes a token if there is one. Returns 0, or the seconds until the next token.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+            self.updated_at = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0.0
+            return (1 - self.tokens) / self.rate
+
+    def acquire(self, max_wait: float = MAX_WAIT) -> bool:
+        """
+            Waits (up to `max_wait` seconds) for a token.
+
+            Returns:
+                bool: False if no token became available in time.
+        """
+        deadline = time.monotonic() + max_wait
+        while True:
+            wait = self._reserve()
+            if not wait:
+                return True
+            if time.monotonic() + wait > deadline:
+                return False
+            time.sleep(wait)
+
+    def penalize(self, seconds: float) -> None:
+        """
+            Empties the bucket so that the next token is `seconds` away
+            (e.g. after the provider answered "retry after").
+        """
+        with self._lock:
+            self.tokens = min(self.tokens, 0) - seconds * self.rate
+            self.updated_at = time.monotonic()
+
+
+class CircuitBreaker:
+    """
+        Fails fast while the provider is down.
+
+        After `threshold` consecutive failures the circuit opens and calls are
+        refused for `reset_timeout` seconds. Then one trial call is let through
+        (half-open): its success closes the circuit, its failure opens it again.
+    """
+
+    def __init__(self, threshold: int = BREAKER_THRESHOLD, reset_timeout: float = BREAKER_RESET_TIMEOUT):
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self._trial = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return 'closed'
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return 'half-open'
+        return 'open'
+
+    def enter(self):
+        """
+            Asks to make a call.
+
+            Returns:
+                bool | None: None if the call is refused, otherwise whether it
+                             is the half-open trial (then release_trial() must
+                             be called once it is over).
+        """
+        with self._lock:
+            state = self.state
+            if state == 'closed':
+                return False
+            if state == 'half-open' and not self._trial:
+                self._trial = True
+                return True
+            return None
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self._trial or self.failures >= self.threshold:
+                self.opened_at = time.monotonic()
+            self._trial = False
+
+    def release_trial(self) -> None:
+        """
+            Ends a half-open trial call that neither succeeded nor failed
+            (e.g. rate limited), so the next call can be the trial.
+        """
+        with self._lock:
+            self._trial = False
+
+
+class TelegramClient:
+    """
+        Shared Telegram Bot API client.
+
+        - One requests.Session with a connection pool: keep-alive connections
+          are reused, so a message does not pay a TCP+TLS handshake.
+        - Token buckets per chat and for the whole bot keep sends within
+          Telegram's rate limits.
+        - A circuit breaker refuses sends while Telegram keeps failing,
+          instead of making every caller wait for the timeout.
+
+        send_message() never raises: it returns False when the message was not
+        sent (callers such as the OTP delivery task retry later).
+    """
+
+    def __init__(self, token: str, base_url: str = 'https://api.telegram.org', timeout=TIMEOUT,
+                 pool_size: int = 10):
+        self.url = f"{base_url.rstrip('/')}/bot{token}/sendMessage"
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.breaker = CircuitBreaker()
+        self.global_bucket = TokenBucket(GLOBAL_RATE, GLOBAL_RATE)
+        self._chat_buckets = {}
+        self._lock = threading.Lock()
+
+    def _chat_bucket(self, chat_id) -> TokenBucket:
+        with self._lock:
+            bucket = self._chat_buckets.get(chat_id)
+            if bucket is None:
+                bucket = self._chat_buckets[chat_id] = TokenBucket(CHAT_RATE, CHAT_BURST)
+            return bucket
+
+    def send_message(self, chat_id, text: str) -> bool:
+        """
+            Sends a text message to a chat.
+
+            Returns:
+                bool: True if Telegram accepted the message.
+        """
+        if not self._chat_bucket(chat_id).acquire() or not self.global_bucket.acquire():
+            logger.warning(f"[TELEGRAM] Rate limit reached for chat {chat_id}, message not sent")
+            return False
+        trial = self.breaker.enter()
+        if trial is None:
+            logger.warning("[TELEGRAM] Circuit open, message not sent")
+            return False
+        try:
+            return self._post(chat_id, text)
+        finally:
+            if trial:
+                self.breaker.release_trial()
+
+    def _post(self, chat_id, text: str) -> bool:
+        try:
+            response = self.session.post(self.url, data={"chat_id": chat_id, "text": text}, timeout=self.timeout)
+        except requests.RequestException as e:
+            self.breaker.record_failure()
+            logger.error(f"[TELEGRAM] Failed to send message: {e}")
+            return False
+
+        if response.status_code == 429:
+            # Rate limited: Telegram is up, back off this chat without opening the circuit
+            retry_after = retry_after_seconds(response)
+            self._chat_bucket(chat_id).penalize(retry_after)
+            logger.warning(f"[TELEGRAM] Rate limited by Telegram, retry after {retry_after}s")
+            return False
+        if response.status_code >= 500:
+            self.breaker.record_failure()
+            logger.error(f"[TELEGRAM] Failed to send message: HTTP {response.status_code}")
+            return False
+
+        self.breaker.record_success()
+        if response.status_code != 200:
+            logger.error(f"[TELEGRAM] Message rejected: HTTP {response.status_code} {response.text[:200]}")
+            return False
+        return True
+
+
+def retry_after_seconds(response) -> float:
+    """
+        Reads the back-off of a 429 answer: parameters.retry_after of the
+        JSON body, else the Retry-After header, else 1 second.
+    """
+    try:
+        return float(response.json()["parameters"]["retry_after"])
+    except (ValueError, KeyError, TypeError):
+        pass
+    try:
+        return float(response.headers.get("Retry-After", 1))
+    except ValueError:
+        return 1.0
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_telegram_client() -> TelegramClient:
+    """
+        Returns the process-wide Telegram client (created on first use, so
+        forked worker processes do not share the parent's connections).
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = TelegramClient(
+                    settings.TELEGRAM_BOT_TOKEN,
+                    base_url=getattr(settings, 'TELEGRAM_API_URL', 'https://api.telegram.org'),
+                )
+    return _client
@@ -1,3 +1,133 @@
-from django.test import TestCase
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache
+from django.test import SimpleTestCase
+
+from apps.utils.cache import CACHE_KEY_LOCK, get_or_compute
+from apps.utils.telegram import CircuitBreaker, TelegramClient
+
+
+class StubTelegramHandler(BaseHTTPRequestHandler):
+    """
+        Answers sendMessage calls with the server's next status code
+        (200 once the queue is empty) and records the client ports.
+    """
+    protocol_version = 'HTTP/1.1'
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        self.server.ports.append(self.client_address[1])
+        status = self.server.statuses.pop(0) if self.server.statuses else 200
+        if status == 429 and self.server.plain_429:
+            body = b"Too Many Requests"
+        else:
+            body = json.dumps({"ok": status == 200, "parameters": {"retry_after": 0}}).encode()
+        self.send_response(status)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class TelegramClientTests(SimpleTestCase):
+    """
+        TelegramClient against a local stub of the Bot API.
+    """
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), StubTelegramHandler)
+        self.server.ports, self.server.statuses, self.server.plain_429 = [], [], False
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+
+        self.client = TelegramClient('TOKEN', base_url=f'http://127.0.0.1:{self.server.server_port}')
+        self.client.breaker = CircuitBreaker(threshold=2, reset_timeout=0.1)
+        self.addCleanup(self.client.session.close)
+
+    def test_connection_is_reused(self):
+        for chat_id in range(5):
+            self.assertTrue(self.client.send_message(chat_id, 'hello'))
+        self.assertEqual(len(self.server.ports), 5)
+        self.assertEqual(len(set(self.server.ports)), 1)
+
+    def test_chat_is_throttled(self):
+        with mock.patch('apps.utils.telegram.CHAT_BURST', 2), mock.patch('apps.utils.telegram.CHAT_RATE', 10.0):
+            start = time.monotonic()
+            for _ in range(4):
+                self.assertTrue(self.client.send_message(1, 'hello'))
+            elapsed = time.monotonic() - start
+        # Two sends from the burst, two more at 10 per second
+        self.assertGreaterEqual(elapsed, 0.15)
+
+    def test_throttled_chat_gives_up_after_max_wait(self):
+        with mock.patch('apps.utils.telegram.CHAT_BURST', 1), mock.patch('apps.utils.telegram.CHAT_RATE', 0.1):
+            self.assertTrue(self.client.send_message(1, 'hello'))
+            self.assertFalse(self.client.send_message(1, 'hello'))
+            self.assertTrue(self.client.send_message(2, 'hello'))
+        self.assertEqual(len(self.server.ports), 2)
+
+    def test_breaker_opens_half_opens_and_closes(self):
+        self.server.statuses = [502, 502]
+        self.assertFalse(self.client.send_message(1, 'hello'))
+        self.assertFalse(self.client.send_message(2, 'hello'))
+        self.assertEqual(self.client.breaker.state, 'open')
+
+        # Open: refused without calling the server
+        self.assertFalse(self.client.send_message(3, 'hello'))
+        self.assertEqual(len(self.server.ports), 2)
+
+        time.sleep(0.15)
+        self.assertEqual(self.client.breaker.state, 'half-open')
+        self.assertTrue(self.client.send_message(4, 'hello'))
+        self.assertEqual(self.client.breaker.state, 'closed')
+
+    def test_failed_trial_reopens_breaker(self):
+        self.server.statuses = [502, 502, 502]
+        self.client.send_message(1, 'hello')
+        self.client.send_message(2, 'hello')
+        time.sleep(0.15)
+        self.assertFalse(self.client.send_message(3, 'hello'))
+        self.assertEqual(self.client.breaker.state, 'open')
+
+    def test_rate_limited_trial_does_not_block_breaker(self):
+        self.server.statuses = [502, 502, 429]
+        self.client.send_message(1, 'hello')
+        self.client.send_message(2, 'hello')
+        time.sleep(0.15)
+        self.assertFalse(self.client.send_message(3, 'hello'))
+        self.assertEqual(self.client.breaker.state, 'half-open')
+        self.assertTrue(self.client.send_message(4, 'hello'))
+        self.assertEqual(self.client.breaker.state, 'closed')
+
+    def test_429_without_json_body(self):
+        self.server.statuses, self.server.plain_429 = [429], True
+        self.assertFalse(self.client.send_message(1, 'hello'))
+        self.assertEqual(self.client.breaker.state, 'closed')
+
+
+class GetOrComputeTests(SimpleTestCase):
+    """
+        Single-flight lock of apps.utils.cache.get_or_compute.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+    def test_lock_is_released_after_compute(self):
+        self.assertEqual(get_or_compute('key', lambda: 1, 60), 1)
+        self.assertIsNone(cache.get(CACHE_KEY_LOCK.format(key='key')))
+
+    def test_waiter_keeps_the_winners_lock(self):
+        lock_key = CACHE_KEY_LOCK.format(key='key')
+        cache.add(lock_key, 'winner', 10)
+        with mock.patch('apps.utils.cache.LOCK_WAIT', 0.1):
+            self.assertEqual(get_or_compute('key', lambda: 1, 60), 1)
+        self.assertEqual(cache.get(lock_key), 'winner')
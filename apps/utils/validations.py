@@ -1,12 +1,12 @@
 import re
 from decimal import Decimal
 from django.core.exceptions import ValidationError
-from apps.transfers.models import Transfer
-from apps.cards.models.card import Card
+from apps.transfers.archive import transfer_exists
+from apps.cards.models.card import AUTH_FIELDS, Card
+from apps.utils.services import parse_expire
 
 
 ALLOWED_CURRENCIES = [643, 840]  # 643 = RUB, 840 = USD
-MAX_OTP_ATTEMPTS = 3
 
 
 class CardValidationMixin:
@@ -122,7 +122,7 @@ class TransferValidationMixin(CardValidationMixin):
     - Currency validation (must be allowed)
     - Sender and receiver card validation
     - Balance and status checks
-    - OTP validation with retry limit
+    - OTP format validation
     """
 
     def clean_ext_id(self):
@@ -135,7 +135,7 @@ class TransferValidationMixin(CardValidationMixin):
             raise ValidationError("External ID is required")
 
         if hasattr(self, 'check_ext_id_uniqueness') and self.check_ext_id_uniqueness:
-            if Transfer.objects.filter(ext_id=ext_id).exists():
+            if transfer_exists(ext_id):
                 raise ValidationError("External ID already exists")
         return ext_id
 
@@ -221,13 +221,12 @@ class TransferValidationMixin(CardValidationMixin):
 
     def clean_otp(self):
         """
-        Validates OTP code for transfer confirmation.
+        Validates the OTP code format for transfer confirmation.
         - Must be 6 digits
-        - Checks against stored OTP in Transfer
-        - Enforces maximum retry attempts
+        The code itself and the retry limit are checked against the
+        OTP store (apps.utils.otp) by the confirm view.
         """
         otp = self.cleaned_data.get("otp", "").strip()
-        transfer_id = self.cleaned_data.get("transfer_id")
 
         if not otp:
             raise ValidationError("OTP code is required")
@@ -235,23 +234,6 @@ class TransferValidationMixin(CardValidationMixin):
         if not otp.isdigit() or len(otp) != 6:
             raise ValidationError("OTP must be a 6-digit number")
 
-        if transfer_id:
-            try:
-                transfer = Transfer.objects.get(id=transfer_id)
-
-                if transfer.try_count >= MAX_OTP_ATTEMPTS:
-                    raise ValidationError("Maximum OTP attempts exceeded")
-
-                if str(transfer.otp) != str(otp):
-                    transfer.try_count += 1
-                    transfer.save(update_fields=['try_count'])
-
-                    attempts_left = MAX_OTP_ATTEMPTS - transfer.try_count
-                    raise ValidationError(f"Incorrect OTP. {attempts_left} attempts left")
-
-            except Transfer.DoesNotExist:
-                raise ValidationError("Transfer not found")
-
         return otp
 
     def clean(self):
@@ -261,6 +243,8 @@ class TransferValidationMixin(CardValidationMixin):
         - Receiver card must exist
         - Sender card must be active
         - Sender must have enough balance
+
+        Both cards are loaded with one query, with only the columns checked here.
         """
         cleaned = super().clean()
         sender_card_number = cleaned.get("sender_card_number")
@@ -271,14 +255,18 @@ class TransferValidationMixin(CardValidationMixin):
         if not all([sender_card_number, sender_card_expiry, receiver_card_number, sending_amount]):
             return cleaned
 
-        try:
-            sender = Card.objects.get(card_number=sender_card_number, expire=sender_card_expiry)
-        except Card.DoesNotExist:
+        cards = {
+            card.card_number: card
+            for card in Card.objects.filter(card_number__in=[sender_card_number, receiver_card_number])
+            .only(*AUTH_FIELDS, "expire_month", "expire_year")
+        }
+        sender = cards.get(sender_card_number)
+        receiver = cards.get(receiver_card_number)
+
+        if sender is None or (sender.expire_month, sender.expire_year) != parse_expire(sender_card_expiry, year_only=False):
             raise ValidationError("Sender card not found or expiry date mismatch")
 
-        try:
-            receiver = Card.objects.get(card_number=receiver_card_number)
-        except Card.DoesNotExist:
+        if receiver is None:
             raise ValidationError("Receiver card not found")
 
         if sender.status != "active":
@@ -287,7 +275,4 @@ class TransferValidationMixin(CardValidationMixin):
         if sender.balance is None or sender.balance < Decimal(str(sending_amount)):
             raise ValidationError("Insufficient sender balance")
 
-        self.sender = sender
-        self.receiver = receiver
-
         return cleaned
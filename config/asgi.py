@@ -14,3 +14,9 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 
 application = get_asgi_application()
+
+# Build the card Bloom filter now (in each worker, or once before forking with
+# --preload) instead of on the first request that needs it
+from apps.cards.bloom import warm_card_filter  # noqa: E402
+
+warm_card_filter()
@@ -19,4 +19,20 @@ app.conf.beat_schedule = {
         'task': 'apps.utils.tasks.telegram_report',
         'schedule': crontab(minute=0, hour=0),
     },
+    'apply-ledger-credits-every-10-seconds': {
+        'task': 'apps.cards.tasks.apply_ledger_credits_task',
+        'schedule': 10.0,
+    },
+    'snapshot-card-balances-every-5-minutes': {
+        'task': 'apps.cards.tasks.snapshot_card_balances_task',
+        'schedule': crontab(minute='*/5'),
+    },
+    'refresh-transfer-rollups-every-minute': {
+        'task': 'apps.transfers.tasks.refresh_transfer_rollups_task',
+        'schedule': crontab(minute='*'),
+    },
+    'archive-transfers-every-night': {
+        'task': 'apps.transfers.tasks.archive_transfers_task',
+        'schedule': crontab(minute=30, hour=3),
+    },
 }
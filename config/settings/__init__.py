@@ -1,4 +1,5 @@
 from .base import *
+from .cache import *
 from .celery import *
 from .database import *
 from .installapps import *
@@ -0,0 +1,35 @@
+import os
+
+# Shared cache (OTP codes/attempts, card info versions, Bloom filter markers, ...).
+# Every web and Celery worker process must see the same data, so it defaults
+# to the project's Redis (the one the Celery broker uses, separate DB number).
+# REDIS_CACHE_URL= (empty) switches to a per-process local-memory cache, only
+# usable when everything runs in one process (tests); see apps.utils.checks.
+REDIS_CACHE_URL = os.getenv('REDIS_CACHE_URL', 'redis://127.0.0.1:6380/1')
+
+if REDIS_CACHE_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_CACHE_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'unired-default',
+        }
+    }
+
+# OTP lifetime in seconds and allowed wrong attempts per transfer
+OTP_TTL = int(os.getenv('OTP_TTL', 300))
+OTP_MAX_ATTEMPTS = 3
+
+# OTP delivery (apps.utils.otp_backends): default backend, and backends
+# for phone prefixes (longest prefix wins), e.g. {'+998': '...SMSBackend'}.
+# Use LocMemBackend for load tests: no network I/O, codes are counted.
+OTP_DELIVERY_BACKEND = os.getenv('OTP_DELIVERY_BACKEND', 'apps.utils.otp_backends.TelegramBackend')
+OTP_DELIVERY_ROUTES = {}
+SMS_GATEWAY_URL = os.getenv('SMS_GATEWAY_URL')
+SMS_GATEWAY_TOKEN = os.getenv('SMS_GATEWAY_TOKEN')